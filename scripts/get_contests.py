@@ -15,10 +15,16 @@ from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import boto3  # type: ignore
+import orjson
 import pandas as pd  # type: ignore
 import yaml  # type: ignore
 from botocore.exceptions import ClientError  # type: ignore
 
+try:
+    from yaml import CSafeLoader as _SafeLoader  # type: ignore
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader as _SafeLoader  # type: ignore
+
 
 DATA_DIR = Path("data")
 CONTESTS_JSON_LOCAL = DATA_DIR / "contests.json"
@@ -27,7 +33,7 @@ DK_ENTRIES_CLASSIFIED_CSV = DATA_DIR / "DKEntriesClassified.csv"
 CONTESTS_YAML_PATH = Path("src") / "contests.yaml"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AwsLocation:
     bucket: str
     prefix: str
@@ -115,8 +121,8 @@ def normalize_contest_id(value: Any) -> Optional[str]:
 
 
 def load_contests_frame(contests_path: Path) -> pd.DataFrame:
-    with contests_path.open("r", encoding="utf-8") as f:
-        payload = json.load(f)
+    with contests_path.open("rb") as f:
+        payload = orjson.loads(f.read())
     # Handle either a top-level list or an object with "Contests" list
     if isinstance(payload, list):
         contests_list = payload
@@ -199,8 +205,8 @@ def classify_field_size(num_entrants: Optional[float], thresholds: Dict[str, Dic
 
 def load_classification_thresholds(yaml_path: Path) -> Dict[str, Dict[str, Any]]:
     try:
-        with yaml_path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        with yaml_path.open("rb") as f:
+            data = yaml.load(f, Loader=_SafeLoader) or {}
     except FileNotFoundError as exc:
         raise SystemExit(f"Missing classification YAML at {yaml_path}") from exc
     if not isinstance(data, dict):
@@ -239,12 +245,11 @@ def main() -> None:
     contests_df = load_contests_frame(CONTESTS_JSON_LOCAL)
     if contests_df.empty:
         raise SystemExit(f"No contests found in {CONTESTS_JSON_LOCAL}")
-    merged_df = entries_df.merge(
-        contests_df[["id", "m", "dg"]],
-        how="left",
-        left_on="Contest ID",
-        right_on="id",
-    )
+    # Left join on the normalized id via index-aligned lookups; no hash-join frame copy
+    contests_by_id = contests_df.drop_duplicates(subset="id", keep="first").set_index("id")
+    merged_df = entries_df.copy()
+    for col in ("m", "dg"):
+        merged_df[col] = entries_df["Contest ID"].map(contests_by_id[col])
     # 4) Add num_entrants
     merged_df["num_entrants"] = merged_df["m"]
 
@@ -271,7 +276,8 @@ def main() -> None:
     merged_df.to_csv(DK_ENTRIES_CLASSIFIED_CSV, index=False, columns=output_columns)
 
     # Summary
-    matched_count = int(merged_df["id"].notna().sum()) if "id" in merged_df.columns else 0
+    # Rows whose Contest ID found a contest in the join above
+    matched_count = int(entries_df["Contest ID"].isin(contests_by_id.index).sum())
     classification_counts = (
         merged_df["field_size_classification"].value_counts(dropna=False).to_dict()
         if "field_size_classification" in merged_df.columns
@@ -9,6 +9,8 @@ import os
 import shlex
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +19,11 @@ from typing import Dict, Iterable, List, Optional, Tuple
 import pandas as pd  # type: ignore
 import yaml  # type: ignore
 
+try:
+	from yaml import CSafeLoader as _SafeLoader  # type: ignore
+except ImportError:  # libyaml not available
+	from yaml import SafeLoader as _SafeLoader  # type: ignore
+
 # Ensure project root on sys.path so `tools` and `src` can be imported when invoked from anywhere
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
@@ -24,6 +31,7 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from tools.aggregate_lineups import aggregate, Source as AggSource  # type: ignore
 from src.dk_upload import load_dk_entries, format_lineups_for_dk  # type: ignore
+from src.feature_diversify.cli import main as _diversify_main  # type: ignore
 
 
 DATA_DIR = PROJECT_ROOT / "data"
@@ -96,8 +104,8 @@ def load_classification_info() -> Tuple[pd.DataFrame, Dict[str, int], List[str]]
 
 
 def read_yaml_runs() -> Dict[str, Dict[str, str]]:
-	with open(CONTESTS_YAML_PATH, "r", encoding="utf-8") as f:
-		yml = yaml.safe_load(f) or {}
+	with open(CONTESTS_YAML_PATH, "rb") as f:
+		yml = yaml.load(f, Loader=_SafeLoader) or {}
 	if not isinstance(yml, dict):
 		_fail(f"Unexpected YAML structure in {CONTESTS_YAML_PATH}")
 	# Keep sections: each label maps to dict of run_* plus thresholds
@@ -139,14 +147,47 @@ def _find_latest_child_output(run_dir: Path) -> Optional[Path]:
 	return fallback if fallback.exists() else None
 
 
-@dataclass
+def _solver_threads(args: List[str]) -> int:
+	# run.sh passes SOLVER_THREADS (default 10) as --solver-threads, then the run's own args,
+	# so a --solver-threads in the YAML run wins (argparse keeps the last value)
+	value = os.environ.get("SOLVER_THREADS") or "10"
+	for i, tok in enumerate(args):
+		if tok == "--solver-threads" and i + 1 < len(args):
+			value = args[i + 1]
+		elif tok.startswith("--solver-threads="):
+			value = tok.split("=", 1)[1]
+	try:
+		return max(1, int(value))
+	except ValueError:
+		return 10
+
+
+def _execute_run(label: str, base_intermediate: Path, idx: int, run_token: str, args: List[str]) -> Tuple[int, str, Optional[Path]]:
+	run_dir = base_intermediate / run_token
+	run_dir.mkdir(parents=True, exist_ok=True)
+	env = os.environ.copy()
+	env["OUTDIR"] = str(run_dir)
+	cmd = ["bash", "run.sh", *args]
+	_log(f"Executing ({label}/{run_token}): {' '.join(cmd)}")
+	# Runs execute concurrently: capture each one's output and print it as one prefixed block
+	proc = subprocess.run(cmd, cwd=str(PROJECT_ROOT), env=env, check=False, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+	prefix = f"[{label}/{run_token}] "
+	output = "".join(prefix + line for line in proc.stdout.splitlines(keepends=True))
+	if output:
+		print(output, end="" if output.endswith("\n") else "\n", flush=True)
+	_log(f"Finished ({label}/{run_token}) with exit code {proc.returncode}")
+	out_xlsx = _find_latest_child_output(run_dir)
+	return idx, run_token, (out_xlsx if out_xlsx and out_xlsx.exists() else None)
+
+
+@dataclass(slots=True)
 class BundleResult:
 	label: str
 	outfile: Path
 	sources: List[Tuple[Path, str]]
 
 
-def bundle_for_label(ts: str, label: str, run_map: Dict[str, str]) -> BundleResult:
+def bundle_for_label(ts: str, label: str, run_map: Dict[str, str], dk_entries_df: Optional[pd.DataFrame] = None) -> BundleResult:
 	_log(f"Bundling runs for '{label}'")
 	# Order runs by run_1, run_2, ...
 	def _run_key(k: str) -> Tuple[int, str]:
@@ -159,29 +200,28 @@ def bundle_for_label(ts: str, label: str, run_map: Dict[str, str]) -> BundleResu
 		_fail(f"No runs defined in YAML for '{label}'")
 	base_intermediate = OUTPUT_DIR / ts / "bundle" / "intermediate" / label
 	base_intermediate.mkdir(parents=True, exist_ok=True)
+	# Runs are independent (each gets its own OUTDIR), so execute them concurrently, but only
+	# as many at once as the CPU can host at the largest per-run solver thread count
+	jobs = [(idx, f"Run{idx}", _extract_run_args(run_map[key])) for idx, key in enumerate(ordered, start=1)]
+	threads_per_run = max(_solver_threads(args) for _, _, args in jobs)
+	max_workers = max(1, min(len(jobs), (os.cpu_count() or 1) // threads_per_run))
+	with ThreadPoolExecutor(max_workers=max_workers) as pool:
+		results = list(pool.map(lambda job: _execute_run(label, base_intermediate, *job), jobs))
+	# aggregate() breaks projection ties by source order (stable sort), so keep sources in run order
+	results.sort(key=lambda r: r[0])
 	sources: List[Tuple[Path, str]] = []
-	for idx, key in enumerate(ordered, start=1):
-		args = _extract_run_args(run_map[key])
-		run_token = f"Run{idx}"
-		run_dir = base_intermediate / run_token
-		run_dir.mkdir(parents=True, exist_ok=True)
-		env = os.environ.copy()
-		env["OUTDIR"] = str(run_dir)
-		cmd = ["bash", "run.sh", *args]
-		_log(f"Executing ({label}/{run_token}): {' '.join(cmd)}")
-		subprocess.run(cmd, cwd=str(PROJECT_ROOT), env=env, check=False)
-		out_xlsx = _find_latest_child_output(run_dir)
-		if out_xlsx and out_xlsx.exists():
+	for idx, run_token, out_xlsx in results:
+		if out_xlsx is not None:
 			sources.append((out_xlsx, run_token))
 			_log(f"Collected: {out_xlsx}")
 		else:
-			_log(f"Warning: missing output for {label}/{run_token} expected at {run_dir}/*/lineups.xlsx")
+			_log(f"Warning: missing output for {label}/{run_token} expected at {base_intermediate / run_token}/*/lineups.xlsx")
 	if not sources:
 		_fail(f"No sources collected for '{label}' (no lineups.xlsx found in any run)")
 	outfile = OUTPUT_DIR / ts / f"{label}.xlsx"
 	# Aggregate using tools.aggregate_lineups
 	agg_sources = [AggSource(path=str(p), value=v) for (p, v) in sources]
-	total, _combined = aggregate(
+	total, _ = aggregate(
 		str(outfile),
 		"Bundle",
 		agg_sources,
@@ -189,6 +229,8 @@ def bundle_for_label(ts: str, label: str, run_map: Dict[str, str]) -> BundleResu
 		engine="xlsxwriter",
 		add_extra_column=True,
 		dk_entries_path=str(DK_ENTRIES_PATH),
+		parquet_sidecar=True,
+		dk_entries=dk_entries_df,
 	)
 	if total == 0:
 		_fail(f"Aggregated 0 lineups for '{label}'")
@@ -198,7 +240,7 @@ def bundle_for_label(ts: str, label: str, run_map: Dict[str, str]) -> BundleResu
 
 def diversify(ts: str, files_by_label: Dict[str, Path], quotas: Dict[str, int], seed: Optional[int]) -> Path:
 	out_path = OUTPUT_DIR / ts / "diversified.xlsx"
-	cmd: List[str] = [_pybin(), "-m", "src.feature_diversify.cli"]
+	cmd: List[str] = []
 	# Inputs
 	for _, fpath in files_by_label.items():
 		cmd += ["--input", str(fpath)]
@@ -210,14 +252,22 @@ def diversify(ts: str, files_by_label: Dict[str, Path], quotas: Dict[str, int],
 	if seed is not None:
 		cmd += ["--random-seed", str(seed)]
 	cmd += ["--out", str(out_path)]
-	_log(f"Diversifying: {' '.join(cmd)}")
-	subprocess.run(cmd, cwd=str(PROJECT_ROOT), check=True)
+	# In-process runs keep the caller's cwd, so hand over the DK entries path explicitly
+	cmd += ["--dk-entries", str(DK_ENTRIES_PATH)]
+	_log(f"Diversifying: src.feature_diversify.cli {' '.join(cmd)}")
+	# Run in-process; avoids a fresh interpreter re-importing pandas/numpy per run
+	try:
+		rc = _diversify_main(cmd)
+	except SystemExit as e:
+		_fail(f"Diversify failed: {e}")
+	if rc != 0:
+		_fail(f"Diversify failed with exit code {rc}")
 	if not out_path.exists():
 		_fail(f"Expected diversified output not found: {out_path}")
 	return out_path
 
 
-def read_diversified_for_upload(diversified_path: Path) -> pd.DataFrame:
+def read_diversified_for_upload(diversified_path: Path, dk_entries_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
 	# Prefer DK Lineups; fall back to Selected and format via dk_upload
 	try:
 		df = pd.read_excel(diversified_path, sheet_name="DK Lineups")
@@ -225,7 +275,8 @@ def read_diversified_for_upload(diversified_path: Path) -> pd.DataFrame:
 	except Exception:
 		pass
 	selected = pd.read_excel(diversified_path, sheet_name="Selected")
-	dk_entries_df = load_dk_entries(str(DK_ENTRIES_PATH))
+	if dk_entries_df is None:
+		dk_entries_df = load_dk_entries(str(DK_ENTRIES_PATH))
 	# Minimal projections frame for IDs (names only)
 	names: List[str] = []
 	for col in ["QB", "RB1", "RB2", "WR1", "WR2", "WR3", "TE", "FLEX", "DST"]:
@@ -242,8 +293,9 @@ def build_upload_csv(
 	diversified_path: Path,
 	entries_classified_df: pd.DataFrame,
 	label_by_source_file: Dict[str, str],
+	dk_entries_df: Optional[pd.DataFrame] = None,
 ) -> Path:
-	df_dk = read_diversified_for_upload(diversified_path)
+	df_dk = read_diversified_for_upload(diversified_path, dk_entries_df)
 	# Ensure necessary player columns exist (renames)
 	col_map = {
 		"RB1": "RB1",
@@ -288,40 +340,9 @@ def build_upload_csv(
 	for c in required_cols:
 		if c not in entries_classified_df.columns:
 			_fail(f"'data/DKEntries.csv' is missing required column in classified output: {c}")
-	out_rows: List[dict] = []
-	for label in selected_by_label.keys():
-		contests = entries_classified_df[entries_classified_df["field_size_classification"] == label]
-		contests = contests.reset_index(drop=True)
-		lineups = selected_by_label.get(label, [])
-		if len(lineups) < len(contests):
-			_fail(f"Not enough selected lineups for '{label}': need {len(contests)}, have {len(lineups)}")
-		for i in range(len(contests)):
-			crow = contests.iloc[i]
-			lrow = lineups[i]
-			out_rows.append(
-				{
-					"Entry ID": crow.get("Entry ID", ""),
-					"Contest Name": crow.get("Contest Name", ""),
-					"Contest ID": crow.get("Contest ID", ""),
-					"Entry Fee": crow.get("Entry Fee", ""),
-					"QB": lrow["QB"],
-					"RB": lrow["RB1"],
-					"RB.1": lrow["RB2"],  # second RB duplicate column label disambiguated on CSV write/read
-					"WR": lrow["WR1"],
-					"WR.1": lrow["WR2"],
-					"WR.2": lrow["WR3"],
-					"TE": lrow["TE"],
-					"FLEX": lrow["FLEX"],
-					"DST": lrow["DST"],
-				}
-			)
-	if not out_rows:
-		_fail("No output rows produced for upload CSV")
-	# Build DataFrame with exact first 13 columns in order
+	# Compose the final header order including duplicates
 	# Note: pandas will prevent exact duplicate column names; we use suffixes for the second RB and WR columns,
 	# then rename to duplicate names when writing CSV via manual writer to preserve headers exactly.
-	df_out = pd.DataFrame(out_rows)
-	# Compose the final header order including duplicates
 	final_headers = [
 		"Entry ID",
 		"Contest Name",
@@ -337,46 +358,68 @@ def build_upload_csv(
 		"FLEX",
 		"DST",
 	]
+	# Output column -> lineup slot it is filled from
+	slot_by_header = {
+		"QB": "QB",
+		"RB": "RB1",
+		"RB.1": "RB2",
+		"WR": "WR1",
+		"WR.1": "WR2",
+		"WR.2": "WR3",
+		"TE": "TE",
+		"FLEX": "FLEX",
+		"DST": "DST",
+	}
+	# Accumulate column-wise (one list per output column) and extend per label
+	out_cols: Dict[str, list] = {h: [] for h in final_headers}
+	for label in selected_by_label.keys():
+		contests = entries_classified_df[entries_classified_df["field_size_classification"] == label]
+		lineups = selected_by_label.get(label, [])
+		if len(lineups) < len(contests):
+			_fail(f"Not enough selected lineups for '{label}': need {len(contests)}, have {len(lineups)}")
+		lineups = lineups[: len(contests)]
+		for c in required_cols:
+			out_cols[c].extend(contests[c].tolist())
+		for header, slot in slot_by_header.items():
+			out_cols[header].extend(lrow[slot] for lrow in lineups)
+	if not out_cols["Entry ID"]:
+		_fail("No output rows produced for upload CSV")
+	df_out = pd.DataFrame(out_cols, columns=final_headers)
 	out_path = OUTPUT_DIR / ts / "DKEntries.csv"
 	out_path.parent.mkdir(parents=True, exist_ok=True)
-	# Write CSV with exact header names requested:
-	with open(out_path, "w", encoding="utf-8", newline="") as f:
-		writer = csv.writer(f)
-		writer.writerow(
-			[
-				"Entry ID",
-				"Contest Name",
-				"Contest ID",
-				"Entry Fee",
-				"QB",
-				"RB",
-				"RB",
-				"WR",
-				"WR",
-				"WR",
-				"TE",
-				"FLEX",
-				"DST",
-			]
-		)
-		for _, r in df_out[final_headers].iterrows():
+	# Write CSV with exact header names requested. Write to a temp file in the same directory and
+	# atomically rename so a crash never leaves a partial upload file behind.
+	fd, tmp_name = tempfile.mkstemp(prefix=".DKEntries.", suffix=".csv.tmp", dir=str(out_path.parent))
+	try:
+		with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+			writer = csv.writer(f)
 			writer.writerow(
 				[
-					r["Entry ID"],
-					r["Contest Name"],
-					r["Contest ID"],
-					r["Entry Fee"],
-					r["QB"],
-					r["RB"],
-					r["RB.1"],
-					r["WR"],
-					r["WR.1"],
-					r["WR.2"],
-					r["TE"],
-					r["FLEX"],
-					r["DST"],
+					"Entry ID",
+					"Contest Name",
+					"Contest ID",
+					"Entry Fee",
+					"QB",
+					"RB",
+					"RB",
+					"WR",
+					"WR",
+					"WR",
+					"TE",
+					"FLEX",
+					"DST",
 				]
 			)
+			writer.writerows(df_out.itertuples(index=False, name=None))
+			f.flush()
+			os.fsync(f.fileno())
+		os.replace(tmp_name, out_path)
+	except BaseException:
+		try:
+			os.unlink(tmp_name)
+		except OSError:
+			pass
+		raise
 	return out_path
 
 
@@ -389,6 +432,8 @@ def main() -> int:
 	run_get_contests(args.date)
 	entries_classified_df, quotas, present_labels = load_classification_info()
 	_log(f"Field sizes present: {present_labels} | quotas={quotas}")
+	# Parse DK entries once; every bundle and the upload step reuse it
+	dk_entries_df = load_dk_entries(str(DK_ENTRIES_PATH))
 	# Step 3: bundle per label present
 	yaml_runs = read_yaml_runs()
 	files_by_label: Dict[str, Path] = {}
@@ -397,7 +442,7 @@ def main() -> int:
 		if label not in yaml_runs:
 			_log(f"Warning: label '{label}' not found in contests.yaml; skipping")
 			continue
-		res = bundle_for_label(ts, label, yaml_runs[label])
+		res = bundle_for_label(ts, label, yaml_runs[label], dk_entries_df)
 		files_by_label[label] = res.outfile
 		# Map the absolute path string used by diversify's 'Source File' back to label
 		abs_outfile = str(res.outfile.resolve())
@@ -409,7 +454,7 @@ def main() -> int:
 	# Step 4: diversify
 	diversified_path = diversify(ts, files_by_label, quotas, args.random_seed)
 	# Step 5: compose upload CSV
-	out_csv = build_upload_csv(ts, diversified_path, entries_classified_df, source_to_label)
+	out_csv = build_upload_csv(ts, diversified_path, entries_classified_df, source_to_label, dk_entries_df)
 	_log(f"DraftKings upload CSV written: {out_csv}")
 	return 0
 
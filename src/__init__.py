@@ -0,0 +1,5 @@
+from .logging_utils import setup_logger
+
+# Module loggers are plain getLogger(__name__) children of "src"; one handler here serves every
+# entry point (src.cli, tools/aggregate_lineups.py, scripts/run_full_pipeline.py, feature_diversify)
+setup_logger(__name__)
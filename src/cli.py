@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import argparse
+import logging
 import sys
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Tuple
 
 import pandas as pd
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from .data_loader import load_and_clean
@@ -24,7 +26,7 @@ from .observability import (
 from .io_utils import ensure_dir
 from .slate_loader import find_single_json_in_data, build_start_time_map, extract_games_table
 
-logger = setup_logger(__name__)
+logger = logging.getLogger(__name__)
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -83,31 +85,25 @@ def build_arg_parser() -> argparse.ArgumentParser:
 def _parse_multi(values: List[str] | None) -> List[str]:
     if not values:
         return []
-    items: List[str] = []
-    for v in values:
-        parts = [x.strip() for x in str(v).split(",") if str(x).strip()]
-        items.extend(parts)
-    return items
+    return [part for v in values for part in (x.strip() for x in str(v).split(",")) if part]
 
 
 def _parse_min_team(values: List[str] | None) -> Dict[str, int]:
     out: Dict[str, int] = {}
     if not values:
         return out
-    for v in values:
-        parts = _parse_multi([v])
-        for part in parts:
-            if ":" not in part:
-                raise SystemExit(f"Invalid --min-team value: '{part}'. Expected TEAM:COUNT")
-            team, count_str = part.split(":", 1)
-            team = team.strip().upper()
-            try:
-                count = int(count_str)
-            except Exception:
-                raise SystemExit(f"Invalid --min-team count in '{part}': must be integer")
-            if count < 0:
-                raise SystemExit(f"Invalid --min-team count in '{part}': must be non-negative")
-            out[team] = count
+    for part in _parse_multi(values):
+        team, sep, count_str = part.partition(":")
+        if not sep:
+            raise SystemExit(f"Invalid --min-team value: '{part}'. Expected TEAM:COUNT")
+        team = team.strip().upper()
+        try:
+            count = int(count_str)
+        except Exception:
+            raise SystemExit(f"Invalid --min-team count in '{part}': must be integer")
+        if count < 0:
+            raise SystemExit(f"Invalid --min-team count in '{part}': must be non-negative")
+        out[team] = count
     return out
 
 
@@ -135,6 +131,39 @@ def _compute_run_dir(outdir: str) -> str:
     return run_dir
 
 
+def _load_projections(use_sabersim: bool, projections_path: str) -> pd.DataFrame:
+    # Load projections either from CSV (default) or SaberSim export when -ss is set
+    if use_sabersim:
+        try:
+            csv_path = find_latest_sabersim_csv("data/", prefix="NFL_")
+        except Exception as e:
+            raise SystemExit(str(e))
+        return load_and_clean_sabersim_csv(csv_path)
+    return load_and_clean(projections_path)
+
+
+def _load_slate(data_dir: str = "data/") -> Tuple[Dict[Tuple[str, str], int], pd.DataFrame]:
+    # Load slate start times from a single JSON in data/; enforce presence
+    try:
+        json_path = find_single_json_in_data(data_dir)
+    except Exception as e:
+        raise SystemExit(str(e))
+    if not json_path:
+        raise SystemExit("No draftables JSON found in data/. Expected exactly one file.")
+    try:
+        start_time_map = build_start_time_map(json_path)
+        games_df = extract_games_table(json_path)
+        logger.info(
+            "Loaded draftables JSON '%s'; start-time entries=%d; games=%d",
+            os.path.basename(json_path),
+            len(start_time_map),
+            len(games_df) if games_df is not None else 0,
+        )
+    except Exception as e:
+        raise SystemExit(f"Failed reading draftables JSON '{json_path}': {e}")
+    return start_time_map, games_df
+
+
 def main(argv: list[str] | None = None) -> int:
     args = build_arg_parser().parse_args(argv)
 
@@ -193,15 +222,12 @@ def main(argv: list[str] | None = None) -> int:
     )
     params.validate()
 
-    # Load projections either from CSV (default) or SaberSim Excel when -ss is set
-    if args.sabersim:
-        try:
-            xlsx_path = find_latest_sabersim_csv("data/", prefix="NFL_")
-        except Exception as e:
-            raise SystemExit(str(e))
-        cleaned = load_and_clean_sabersim_csv(xlsx_path)
-    else:
-        cleaned = load_and_clean(args.projections)
+    # Projections and the draftables JSON are independent reads; overlap them
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        proj_future = pool.submit(_load_projections, bool(args.sabersim), args.projections)
+        slate_future = pool.submit(_load_slate, "data/")
+        cleaned = proj_future.result()
+        start_time_map, games_df = slate_future.result()
     # Determine run directory
     run_dir = _compute_run_dir(args.outdir)
     # Save early snapshots to the run directory as well
@@ -213,24 +239,6 @@ def main(argv: list[str] | None = None) -> int:
     t0 = time.time()
     lineups = generate_lineups(players, params)
     elapsed = time.time() - t0
-    # Load slate start times from a single JSON in data/; enforce presence
-    try:
-        json_path = find_single_json_in_data("data/")
-    except Exception as e:
-        raise SystemExit(str(e))
-    if not json_path:
-        raise SystemExit("No draftables JSON found in data/. Expected exactly one file.")
-    try:
-        start_time_map = build_start_time_map(json_path)
-        games_df = extract_games_table(json_path)
-        logger.info(
-            "Loaded draftables JSON '%s'; start-time entries=%d; games=%d",
-            os.path.basename(json_path),
-            len(start_time_map),
-            len(games_df) if games_df is not None else 0,
-        )
-    except Exception as e:
-        raise SystemExit(f"Failed reading draftables JSON '{json_path}': {e}")
     df = lineups_to_dataframe(lineups, start_time_map=start_time_map)
     snapshot_lineups(lineups, path=os.path.join(run_dir, "lineups.json"))
     snapshot_parameters(params, path=os.path.join(run_dir, "parameters.json"))
@@ -258,6 +266,8 @@ def main(argv: list[str] | None = None) -> int:
 
 
 if __name__ == "__main__":
+    # Under `python -m src.cli` this module's logger is "__main__", outside the "src" handler
+    setup_logger(__name__)
     raise SystemExit(main())
 
 
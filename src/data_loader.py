@@ -1,14 +1,14 @@
 from __future__ import annotations
 
+import logging
 from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
 
 from .io_utils import read_csv, write_csv
-from .logging_utils import setup_logger
 
-logger = setup_logger(__name__)
+logger = logging.getLogger(__name__)
 
 REQUIRED_COLUMNS: Tuple[str, ...] = (
     "Name",
@@ -33,15 +33,20 @@ def validate_columns(df: pd.DataFrame) -> None:
     assert not missing, f"Missing required columns: {missing}"
 
 
-def normalize_ownership(series: pd.Series) -> pd.Series:
-    s = series.astype(float)
-    if s.max() > 1.0:
+def normalize_ownership_array(values: np.ndarray) -> np.ndarray:
+    s = np.asarray(values, dtype=np.float64)
+    present = s[~np.isnan(s)]
+    if present.size and present.max() > 1.0:
         # Treat as percent 0..100
         s = s / 100.0
-    assert (s >= 0).all() and (s <= 1).all(), "Ownership must be within [0,1] after normalization"
+    assert ((s >= 0) & (s <= 1)).all(), "Ownership must be within [0,1] after normalization"
     return s
 
 
+def normalize_ownership(series: pd.Series) -> pd.Series:
+    return pd.Series(normalize_ownership_array(series.to_numpy(dtype=np.float64)), index=series.index, name=series.name)
+
+
 def clean_projections(df: pd.DataFrame) -> pd.DataFrame:
     validate_columns(df)
 
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import csv
-from typing import Dict, List, Optional, Set
+import mmap
+import os
+import re
+from typing import Dict, List, Optional, Set, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -24,93 +28,153 @@ def _normalize_string(value: object) -> str:
     return s.strip()
 
 
+def _dk_header_start(parts: List[str]) -> Optional[int]:
+    # Identify header slice anywhere in the row
+    n = len(DK_ENTRIES_HEADER_PREFIX)
+    for j in range(0, max(0, len(parts) - n + 1)):
+        if [p.strip() for p in parts[j : j + n]] == DK_ENTRIES_HEADER_PREFIX:
+            return j
+    return None
+
+
+def _locate_dk_header(csv_path: str) -> Optional[Tuple[int, int]]:
+    """Return (byte offset of the first row after the DK player header, header column index)."""
+    with open(csv_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = mm.find(",".join(DK_ENTRIES_HEADER_PREFIX).encode("utf-8"))
+            if pos >= 0:
+                line_start = mm.rfind(b"\n", 0, pos) + 1
+                line_end = mm.find(b"\n", pos)
+                line_end = len(mm) if line_end < 0 else line_end + 1
+                parts = next(csv.reader([mm[line_start:line_end].decode("utf-8")]))
+                start_idx = _dk_header_start(parts)
+                if start_idx is not None:
+                    return line_end, start_idx
+    # Slow path for headers that are not byte-identical (e.g. padded with spaces)
+    offset = 0
+    with open(csv_path, "rb") as f:
+        for raw in f:
+            offset += len(raw)
+            if b"Name + ID" not in raw:
+                continue
+            start_idx = _dk_header_start(next(csv.reader([raw.decode("utf-8")])))
+            if start_idx is not None:
+                return offset, start_idx
+    return None
+
+
+def _read_dk_rows(csv_path: str, offset: int, width: int, positions: List[int]) -> pd.DataFrame:
+    """Parse the rows after the DK header with csv.reader, padding short rows with "" and
+    ignoring fields beyond the header width."""
+    columns: Dict[int, List[str]] = {i: [] for i in positions}
+    with open(csv_path, "rb") as f:
+        f.seek(offset)
+        text = f.read().decode("utf-8")
+    for parts in csv.reader(text.splitlines()):
+        if not parts:
+            continue
+        if len(parts) < width:
+            parts = parts + [""] * (width - len(parts))
+        for i in positions:
+            columns[i].append(parts[i])
+    return pd.DataFrame(columns, dtype=str)
+
+
 def load_dk_entries(csv_path: str = "data/DKEntries.csv") -> pd.DataFrame:
     """
     Load DK entries by scanning for the header row that begins with the known DK columns
     and parsing all subsequent rows under that header. Returns a DataFrame with columns:
     Name (str), ID (str), Position (str), TeamAbbrev (str)
     """
-    rows: List[List[str]] = []
-    header: Optional[List[str]] = None
-    start_idx: Optional[int] = None
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        for parts in reader:
-            if not parts:
-                continue
-            # Identify header slice anywhere in the row
-            if header is None:
-                n = len(DK_ENTRIES_HEADER_PREFIX)
-                for j in range(0, max(0, len(parts) - n + 1)):
-                    window = [p.strip() for p in parts[j : j + n]]
-                    if window == DK_ENTRIES_HEADER_PREFIX:
-                        header = window
-                        start_idx = j
-                        break
-                # If we just found header in this row, skip to next row for data
-                if header is not None:
-                    continue
-                else:
-                    # Not a header row; continue scanning
-                    continue
-            # Collect data rows aligned to header start
-            assert start_idx is not None
-            # Some rows may be shorter; pad
-            segment = parts[start_idx : start_idx + len(DK_ENTRIES_HEADER_PREFIX)]
-            segment = (segment + [""] * len(DK_ENTRIES_HEADER_PREFIX))[: len(DK_ENTRIES_HEADER_PREFIX)]
-            rows.append([p.strip() for p in segment])
-
-    if not header:
+    empty = pd.DataFrame({"Name": [], "ID": [], "Position": [], "TeamAbbrev": []})
+    located = _locate_dk_header(csv_path)
+    if located is None:
         # If header not found, return empty DataFrame with expected columns
-        return pd.DataFrame({"Name": [], "ID": [], "Position": [], "TeamAbbrev": []})
+        return empty
+    offset, start_idx = located
+    n = len(DK_ENTRIES_HEADER_PREFIX)
+    keep = ["Name", "ID", "Position", "TeamAbbrev"]
+    keep_positions = {start_idx + DK_ENTRIES_HEADER_PREFIX.index(c): c for c in keep}
 
-    df_full = pd.DataFrame(rows, columns=header)
+    # Hand everything after the header row to the C parser, tokenizing only the four kept
+    # columns. The C parser cannot pad rows when none of them reaches the header width
+    # ("Too many columns specified"), so ragged files fall back to csv.reader below
+    with open(csv_path, "rb") as f:
+        f.seek(offset)
+        try:
+            df = pd.read_csv(
+                f,
+                header=None,
+                names=list(range(start_idx + n)),
+                usecols=list(keep_positions),
+                index_col=False,
+                dtype=str,
+                keep_default_na=False,
+                encoding="utf-8",
+                engine="c",
+            )
+        except pd.errors.EmptyDataError:
+            return empty
+        except pd.errors.ParserError:
+            df = _read_dk_rows(csv_path, offset, start_idx + n, list(keep_positions))
+    df = df.rename(columns=keep_positions)[keep]
     # Normalize and filter
-    for c in ("Name", "ID", "Position", "TeamAbbrev"):
-        if c not in df_full.columns:
-            df_full[c] = ""
-        df_full[c] = df_full[c].astype(str).map(_normalize_string)
-
-    df = df_full[["Name", "ID", "Position", "TeamAbbrev"]].copy()
+    for c in keep:
+        df[c] = df[c].str.strip()
     # Drop blank names and blank IDs (we still keep rows for DST fallback if needed, but prefer non-empty IDs)
     return df
 
 
-def build_name_to_id_map(dk_df: pd.DataFrame) -> Dict[str, str]:
+def _normalized_column(df: pd.DataFrame, col: str) -> List[str]:
+    if col not in df.columns:
+        return [""] * len(df)
+    return [_normalize_string(v) for v in df[col].tolist()]
+
+
+def _first_id_by_name(names: List[str], ids: List[str]) -> Dict[str, str]:
     mapping: Dict[str, str] = {}
-    for _, row in dk_df.iterrows():
-        name = _normalize_string(row.get("Name", ""))
-        pid = _normalize_string(row.get("ID", ""))
-        if not name or not pid:
-            continue
-        if name not in mapping:
-            mapping[name] = pid
+    for name, pid in zip(names, ids):
+        if name and pid:
+            mapping.setdefault(name, pid)
     return mapping
 
 
+def build_name_to_id_map(dk_df: pd.DataFrame) -> Dict[str, str]:
+    return _first_id_by_name(_normalized_column(dk_df, "Name"), _normalized_column(dk_df, "ID"))
+
+
 def build_name_to_id_map_from_projections(df: pd.DataFrame, id_col: str = "DFS ID") -> Dict[str, str]:
     mapping: Dict[str, str] = {}
     if df is None or df.empty or id_col not in df.columns or "Name" not in df.columns:
         return mapping
-    for _, row in df.iterrows():
-        name = _normalize_string(row.get("Name", ""))
-        pid = _normalize_string(row.get(id_col, ""))
-        if not name or not pid:
-            continue
-        if name not in mapping:
-            mapping[name] = pid
-    return mapping
+    return _first_id_by_name(_normalized_column(df, "Name"), _normalized_column(df, id_col))
+
+
+# "Name (ID)" / "Name (TEAM)" -> "Name"; greedy so the split happens at the last " ("
+BASE_NAME_RE = re.compile(r"^(.*) \(.*\)$", re.DOTALL)
 
 
 def _extract_base_name(value: object) -> str:
     s = _normalize_string(value)
-    if s.endswith(")") and "(" in s:
-        # Take substring before the last " ("
-        try:
-            return s.rsplit(" (", 1)[0].strip()
-        except Exception:
-            return s
-    return s
+    m = BASE_NAME_RE.match(s)
+    return m.group(1).strip() if m else s
+
+
+def extract_base_names(values: pd.Series) -> pd.Series:
+    """Vectorized _extract_base_name over a Series of player cells."""
+    # Lineups repeat the same players; normalize and match each distinct cell once
+    codes, uniques = pd.factorize(values)
+    cells = [_normalize_string(v) for v in uniques]
+    na_pos = np.flatnonzero(codes < 0)
+    if len(na_pos):
+        # Missing cells stringify by flavour (None -> "", NaN -> "nan"), so keep them per cell
+        codes[na_pos] = np.arange(len(cells), len(cells) + len(na_pos))
+        cells.extend(_normalize_string(v) for v in values.iloc[na_pos].tolist())
+    s = pd.Series(cells, dtype=str)
+    base = s.str.extract(BASE_NAME_RE, expand=False).str.strip().fillna(s)
+    return pd.Series(base.take(codes).to_numpy(), index=values.index, name=values.name, dtype=base.dtype)
 
 
 def format_lineups_for_dk(
@@ -127,7 +191,8 @@ def format_lineups_for_dk(
     if lineups_df is None or lineups_df.empty:
         return lineups_df.copy()
 
-    out = lineups_df.copy()
+    # Player columns are replaced wholesale below, so a shallow copy is enough
+    out = lineups_df.copy(deep=False)
     player_cols_all = ["QB", "RB1", "RB2", "WR1", "WR2", "WR3", "TE", "FLEX", "DST"]
     player_cols = [c for c in player_cols_all if c in out.columns]
     if not player_cols:
@@ -140,55 +205,45 @@ def format_lineups_for_dk(
         name_to_id = {**name_to_id, **name_to_id_override}
 
     # Build quick lookup for positions/teams from projections
-    proj = projections_df.copy()
-    proj["Name"] = proj["Name"].astype(str).map(_normalize_string)
-    if "Position" in proj.columns:
-        proj["Position"] = proj["Position"].astype(str).map(_normalize_string)
-    if "Team" in proj.columns:
-        proj["Team"] = proj["Team"].astype(str).map(_normalize_string).str.upper()
-    name_to_position = proj.groupby("Name")["Position"].first() if "Position" in proj.columns else {}
-    name_to_team = proj.groupby("Name")["Team"].first() if "Team" in proj.columns else {}
+    proj_names = _normalized_column(projections_df, "Name")
+    name_to_position: Dict[str, str] = {}
+    if "Position" in projections_df.columns:
+        for name, pos in zip(proj_names, _normalized_column(projections_df, "Position")):
+            name_to_position.setdefault(name, pos)
+    name_to_team: Dict[str, str] = {}
+    if "Team" in projections_df.columns:
+        for name, team in zip(proj_names, _normalized_column(projections_df, "Team")):
+            name_to_team.setdefault(name, team.upper())
 
     # DK DST lookup by team
     dk_dst_by_team: Dict[str, str] = {}
-    for _, r in dk_entries_df.iterrows():
-        pos = _normalize_string(r.get("Position", ""))
-        team = _normalize_string(r.get("TeamAbbrev", "")).upper()
-        pid = _normalize_string(r.get("ID", ""))
-        if pos == "DST" and team and pid and team not in dk_dst_by_team:
-            dk_dst_by_team[team] = pid
+    for pos, team, pid in zip(
+        _normalized_column(dk_entries_df, "Position"),
+        _normalized_column(dk_entries_df, "TeamAbbrev"),
+        _normalized_column(dk_entries_df, "ID"),
+    ):
+        team = team.upper()
+        if pos == "DST" and team and pid:
+            dk_dst_by_team.setdefault(team, pid)
 
     missing: Set[str] = set()
-
-    def resolve_id(name: str, column: str) -> Optional[str]:
-        # Try exact name match first
-        pid = name_to_id.get(name)
-        if pid:
-            return pid
-        # DST fallback by team
-        pos = name_to_position[name] if hasattr(name_to_position, "__contains__") and name in name_to_position else None
-        if (pos == "DST") or (column == "DST"):
-            team = name_to_team[name] if hasattr(name_to_team, "__contains__") and name in name_to_team else None
-            if team:
-                pid2 = dk_dst_by_team.get(team)
-                if pid2:
-                    return pid2
-        return None
+    # Empty IDs count as unresolved so they fall through to the DST lookup
+    name_to_id = {k: v for k, v in name_to_id.items() if v}
 
     for c in player_cols:
-        base_names = out[c].map(_extract_base_name)
-        formatted: List[str] = []
-        for bn in base_names:
-            if not bn:
-                formatted.append(bn)
-                continue
-            pid = resolve_id(bn, c)
-            if pid:
-                formatted.append(f"{bn} ({pid})")
-            else:
-                formatted.append(bn)
-                missing.add(bn)
-        out[c] = formatted
+        base_names = extract_base_names(out[c])
+        present = base_names != ""
+        pid = base_names.map(name_to_id)
+        # DST fallback by team
+        if c == "DST":
+            needs_dst = pid.isna()
+        else:
+            needs_dst = pid.isna() & (base_names.map(name_to_position) == "DST")
+        if needs_dst.any():
+            pid = pid.where(~needs_dst, base_names.map(name_to_team).map(dk_dst_by_team))
+        resolved = pid.notna() & present
+        out[c] = np.where(resolved, base_names + " (" + pid.astype(str) + ")", base_names)
+        missing.update(base_names[present & ~resolved].unique())
 
     if missing:
         msg = f"Missing DK IDs for {len(missing)} players: {sorted(missing)}"
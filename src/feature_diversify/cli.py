@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import argparse
 import os
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .io_excel import (
@@ -13,8 +15,9 @@ from .io_excel import (
     parse_source_key,
     read_lineups_from_sources,
 )
-from .selector import SelectionResult, farthest_first_with_quotas, jaccard_distance
-from ..dk_upload import load_dk_entries, format_lineups_for_dk
+from .selector import SelectionResult, farthest_first_with_quotas, pairwise_jaccard_matrix
+from ..dk_upload import extract_base_names, load_dk_entries, format_lineups_for_dk
+from ..io_utils import XLSX_WRITE_OPTIONS, write_sheet_rows
 
 
 def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -33,9 +36,11 @@ def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     p.add_argument("--allow-shortfall", action="store_true", help="If set, allow picking fewer than quota when source is short")
     p.add_argument("--random-seed", type=int, default=None, help="Random seed (for deterministic tie-break ordering)")
     p.add_argument("--out", required=True, help="Output Excel path for diversified selection")
+    p.add_argument("--dk-entries", default="data/DKEntries.csv", help="Path to DK entries CSV for DK Lineups tab")
     return p.parse_args(argv)
 
 
+@lru_cache(maxsize=512)
 def _parse_pick(pick: str, default_sheet: str) -> Tuple[SourceKey, int]:
     if ":" not in pick:
         raise SystemExit(f"Invalid --pick '{pick}'; expected SOURCE:COUNT")
@@ -51,50 +56,38 @@ def _parse_pick(pick: str, default_sheet: str) -> Tuple[SourceKey, int]:
 
 def _build_exposure(selected: List[LineupRecord]) -> Tuple[pd.DataFrame, pd.DataFrame]:
     # Player exposures: token form may contain Name|TEAM; recover these parts when possible
-    from collections import Counter
-
-    player_counter = Counter()
-    team_counter = Counter()
     total = len(selected)
+    tokens = pd.Series([tok for rec in selected for tok in rec.player_tokens], dtype=object)
+    if tokens.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    # Count whole tokens first so only the unique ones need splitting
+    token_counts = tokens.value_counts()
+    parts = token_counts.index.to_series().str.split("|", n=1)
+    has_team = (parts.str.len() == 2).to_numpy()
+    players_df = pd.DataFrame(
+        {
+            "Player": parts.str[0].to_numpy(),
+            "Team": parts.str[1].fillna("").to_numpy(),
+            "#": token_counts.to_numpy(),
+        }
+    )
+    players_df["%"] = (100.0 * players_df["#"] / max(1, total)).round(1)
 
-    for rec in selected:
-        for tok in rec.player_tokens:
-            player_counter[tok] += 1
-            if "|" in tok:
-                _, team = tok.split("|", 1)
-                team_counter[team] += 1
-
-    players_rows = []
-    for tok, cnt in player_counter.most_common():
-        name, team = (tok.split("|", 1) + [None])[:2] if "|" in tok else (tok, None)
-        players_rows.append({
-            "Player": name,
-            "Team": team or "",
-            "#": cnt,
-            "%": round(100.0 * cnt / max(1, total), 1),
-        })
-    teams_rows = []
-    for team, cnt in team_counter.most_common():
-        teams_rows.append({
-            "Team": team,
-            "#": cnt,
-            "%": round(100.0 * cnt / max(1, total * 9), 1),
-        })
-
-    return pd.DataFrame(players_rows), pd.DataFrame(teams_rows)
+    team_counts = (
+        players_df.loc[has_team].groupby("Team", sort=False)["#"].sum().sort_values(ascending=False, kind="stable")
+    )
+    teams_df = pd.DataFrame({"Team": team_counts.index.to_numpy(), "#": team_counts.to_numpy()})
+    teams_df["%"] = (100.0 * teams_df["#"] / max(1, total * 9)).round(1)
+    return players_df, teams_df
 
 
 def _compute_min_dists(selected: List[LineupRecord]) -> List[float]:
-    dists: List[float] = []
-    sets = [s.player_tokens for s in selected]
-    for i, s in enumerate(sets):
-        if len(sets) <= 1:
-            dists.append(float("nan"))
-        else:
-            others = sets[:i] + sets[i + 1 :]
-            d = min(jaccard_distance(s, o) for o in others) if others else float("nan")
-            dists.append(d)
-    return dists
+    if len(selected) <= 1:
+        return [float("nan")] * len(selected)
+    d = pairwise_jaccard_matrix([s.player_tokens for s in selected])
+    np.fill_diagonal(d, np.inf)
+    return d.min(axis=1).tolist()
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
@@ -194,24 +187,12 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         player_cols = [c for c in player_cols_all if c in selected_df.columns]
         proj_min = pd.DataFrame({"Name": []})
         if player_cols:
-            def _extract_name(value: object) -> str:
-                s = str(value) if value is not None else ""
-                s = s.strip()
-                if s.endswith(")") and "(" in s:
-                    try:
-                        return s.rsplit(" (", 1)[0]
-                    except Exception:
-                        return s
-                return s
-            names_series = pd.Series(dtype=object)
+            names: set = set()
             for c in player_cols:
-                names_series = pd.concat(
-                    [names_series, selected_df[c].dropna().astype(str).map(_extract_name)],
-                    ignore_index=True,
-                )
-            unique_names = sorted(set(n for n in names_series.tolist() if n))
+                names.update(extract_base_names(selected_df[c].dropna()).tolist())
+            unique_names = sorted(n for n in names if n)
             proj_min = pd.DataFrame({"Name": unique_names})
-        dk_entries_df = load_dk_entries()
+        dk_entries_df = load_dk_entries(args.dk_entries)
         dk_selected_df = format_lineups_for_dk(selected_df, proj_min, dk_entries_df)
     except Exception:
         # On any failure, fall back to writing only Selected without DK tab
@@ -248,14 +229,15 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     out_dir = os.path.dirname(args.out) or "."
     os.makedirs(out_dir, exist_ok=True)
 
-    with pd.ExcelWriter(args.out, engine="xlsxwriter") as writer:
-        selected_df.to_excel(writer, "Selected", index=False)
+    # Rows are written in order, so constant_memory can stream each sheet instead of holding it in memory
+    with pd.ExcelWriter(args.out, engine="xlsxwriter", engine_kwargs={"options": dict(XLSX_WRITE_OPTIONS)}) as writer:
+        write_sheet_rows(writer, "Selected", selected_df)
         if dk_selected_df is not None:
-            dk_selected_df.to_excel(writer, "DK Lineups", index=False)
-        players_df.to_excel(writer, "Exposure", index=False)
-        teams_df.to_excel(writer, "Teams", index=False)
-        metrics_df.to_excel(writer, "Metrics", index=False)
-        summary_df.to_excel(writer, "Summary", index=False)
+            write_sheet_rows(writer, "DK Lineups", dk_selected_df)
+        write_sheet_rows(writer, "Exposure", players_df)
+        write_sheet_rows(writer, "Teams", teams_df)
+        write_sheet_rows(writer, "Metrics", metrics_df)
+        write_sheet_rows(writer, "Summary", summary_df)
 
     print(
         f"Wrote {len(selected)} diversified lineups to {args.out} | MinJ={result.min_pairwise_jaccard:.3f} AvgJ={result.avg_pairwise_jaccard:.3f}"
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 import os
 import re
+import sys
 
+import numpy as np
 import pandas as pd
 
+from ..io_utils import map_files, read_parquet_sidecar
+
 
 DEFAULT_SHEET_NAME = "Lineups"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SourceKey:
     path: str
     sheet: Optional[str] = None
@@ -20,13 +25,13 @@ class SourceKey:
         return f"{self.path}:{self.sheet or default_sheet}"
 
 
-@dataclass
+@dataclass(slots=True)
 class LineupRecord:
     source_key: str
     row_index: int
     projection: Optional[float]
-    player_tokens: Set[str]
-    original_row: pd.Series
+    player_tokens: FrozenSet[str]
+    original_row: Mapping[str, Any]
 
 
 ROSTER_COLS_CANONICAL: Tuple[str, ...] = (
@@ -42,6 +47,7 @@ ROSTER_COLS_CANONICAL: Tuple[str, ...] = (
 )
 
 
+@lru_cache(maxsize=512)
 def parse_source_key(spec: str) -> SourceKey:
     if ":" in spec:
         path, sheet = spec.split(":", 1)
@@ -51,29 +57,6 @@ def parse_source_key(spec: str) -> SourceKey:
     return SourceKey(path=spec.strip(), sheet=None)
 
 
-def _extract_name_team(value: object) -> Tuple[str, Optional[str]]:
-    s = str(value) if value is not None else ""
-    s = s.strip()
-    if not s:
-        return "", None
-    # Expect formats like "Player Name (TEAM)"; fall back to the whole string as name
-    if s.endswith(")") and "(" in s:
-        try:
-            name, team_with_paren = s.rsplit(" (", 1)
-            team = team_with_paren[:-1]
-            return name.strip(), team.strip() or None
-        except Exception:
-            return s, None
-    return s, None
-
-
-def _normalize_player_token(name: str, team: Optional[str]) -> str:
-    name = name.strip()
-    if team:
-        return f"{name}|{team}"
-    return name
-
-
 def _detect_roster_columns(df: pd.DataFrame, explicit: Optional[Sequence[str]] = None) -> Optional[List[str]]:
     if explicit:
         cols = [c for c in explicit if c in df.columns]
@@ -85,30 +68,70 @@ def _detect_roster_columns(df: pd.DataFrame, explicit: Optional[Sequence[str]] =
     return None
 
 
-def _extract_players_from_row(row: pd.Series, roster_cols: Sequence[str]) -> Set[str]:
-    tokens: Set[str] = set()
-    for c in roster_cols:
-        if c not in row.index:
-            continue
-        name, team = _extract_name_team(row[c])
-        if not name:
-            continue
-        tokens.add(_normalize_player_token(name, team))
-    return tokens
+# "Player Name (TEAM)"; greedy so the split happens at the last " ("
+_NAME_TEAM_RE = re.compile(r"^(.*) \((.*)\)$", re.DOTALL)
 
 
-def _extract_players_from_players_col(row: pd.Series, players_col: str) -> Set[str]:
-    value = row.get(players_col)
-    if value is None:
-        return set()
-    items = [s.strip() for s in str(value).split(",") if s.strip()]
-    tokens: Set[str] = set()
-    for s in items:
-        name, team = _extract_name_team(s)
-        if not name:
-            continue
-        tokens.add(_normalize_player_token(name, team))
-    return tokens
+def _cell_str(value: object) -> str:
+    return str(value) if value is not None else ""
+
+
+def _player_tokens(values: pd.Series) -> np.ndarray:
+    """Columnwise player tokens: "Name (TEAM)" -> "Name|TEAM", anything else -> the stripped
+    cell; "" marks a blank cell."""
+    if isinstance(values.dtype, pd.StringDtype):
+        # Already strings; only missing cells need the str() spelling ("nan")
+        s = values.fillna("nan").str.strip()
+    else:
+        s = values.map(_cell_str).astype(object).str.strip()
+    # Each player repeats across many lineups: parse only the distinct cell strings
+    codes, uniques = pd.factorize(s)
+    u = pd.Series(uniques, dtype=object)
+    parts = u.str.extract(_NAME_TEAM_RE)
+    name = parts[0].str.strip().fillna(u)
+    team = parts[1].str.strip().fillna("")
+    tokens = name.where(team == "", name + "|" + team)
+    # Intern the tokens so every lineup shares one str object per player;
+    # set ops across the pool then hit the identity fast path on equality
+    interned = np.array([sys.intern(str(t)) for t in tokens] + [""], dtype=object)
+    return interned[codes]
+
+
+def _token_sets_from_roster(df: pd.DataFrame, roster_cols: Sequence[str]) -> List[Set[str]]:
+    token_cols = [_player_tokens(df[c]) for c in roster_cols if c in df.columns]
+    if not token_cols:
+        return [set() for _ in range(len(df))]
+    return [{t for t in row if t} for row in zip(*token_cols)]
+
+
+def _token_sets_from_players_col(df: pd.DataFrame, players_col: str) -> List[Set[str]]:
+    cells = df[players_col].map(_cell_str).astype(object)
+    if cells.empty:
+        return []
+    # One split over the joined column instead of a list per row; each cell yields (commas + 1) items
+    owners = np.repeat(np.arange(len(df)), cells.str.count(",").to_numpy(dtype=np.int64) + 1)
+    tokens = _player_tokens(pd.Series(",".join(cells).split(","), dtype=str))
+    token_sets: List[Set[str]] = [set() for _ in range(len(df))]
+    for pos, tok in zip(owners, tokens):
+        if tok:
+            token_sets[pos].add(tok)
+    return token_sets
+
+
+def _read_sheet(path: str, sheet: str, books: Optional[Dict[str, pd.ExcelFile]] = None) -> Optional[pd.DataFrame]:
+    # Aggregated bundles may ship a Parquet copy of their Lineups sheet stamped with this workbook
+    df = read_parquet_sidecar(path, sheet)
+    if df is not None:
+        return df
+    try:
+        if books is None:
+            return pd.read_excel(path, sheet_name=sheet)
+        # Open each workbook once and parse further sheets from the same handle
+        if path not in books:
+            books[path] = pd.ExcelFile(path)
+        return books[path].parse(sheet)
+    except Exception:
+        return None
 
 
 def read_lineups_from_source(
@@ -118,14 +141,14 @@ def read_lineups_from_source(
     roster_cols: Optional[Sequence[str]] = None,
     players_col: Optional[str] = None,
     projection_col: str = "Projection",
+    books: Optional[Dict[str, pd.ExcelFile]] = None,
 ) -> List[LineupRecord]:
     sheet = source.sheet or default_sheet
     if not os.path.exists(source.path):
         # Return empty; caller will decide how to handle missing sources
         return []
-    try:
-        df = pd.read_excel(source.path, sheet_name=sheet)
-    except Exception:
+    df = _read_sheet(source.path, sheet, books)
+    if df is None:
         return []
 
     # Try roster columns first
@@ -145,35 +168,30 @@ def read_lineups_from_source(
         if not using_players_col:
             return []
 
+    if using_players_col:
+        token_sets = _token_sets_from_players_col(df, assert_not_none(players_col))
+    else:
+        token_sets = _token_sets_from_roster(df, assert_not_none(detected_roster))
+    projections: List[Optional[float]] = [None] * len(df)
+    if projection_col in df.columns:
+        proj_arr = pd.to_numeric(df[projection_col], errors="coerce").to_numpy(dtype=np.float64)
+        projections = [None if np.isnan(v) else float(v) for v in proj_arr]
+
     recs: List[LineupRecord] = []
     skey = source.key(default_sheet)
-    for idx, row in df.iterrows():
-        try:
-            if using_players_col:
-                player_tokens = _extract_players_from_players_col(row, assert_not_none(players_col))
-            else:
-                player_tokens = _extract_players_from_row(row, assert_not_none(detected_roster))
-            if len(player_tokens) == 0:
-                continue
-            proj = None
-            if projection_col in df.columns:
-                try:
-                    proj_val = row[projection_col]
-                    proj = float(proj_val) if pd.notna(proj_val) else None
-                except Exception:
-                    proj = None
-            recs.append(
-                LineupRecord(
-                    source_key=skey,
-                    row_index=int(idx),
-                    projection=proj,
-                    player_tokens=player_tokens,
-                    original_row=row,
-                )
-            )
-        except Exception:
-            # Skip malformed rows
+    rows = df.to_dict("records")
+    for idx, player_tokens, proj, row in zip(df.index, token_sets, projections, rows):
+        if len(player_tokens) == 0:
             continue
+        recs.append(
+            LineupRecord(
+                source_key=skey,
+                row_index=int(idx),
+                projection=proj,
+                player_tokens=frozenset(player_tokens),
+                original_row=row,
+            )
+        )
     return recs
 
 
@@ -183,6 +201,16 @@ def assert_not_none(value: Optional[Sequence[str] | str]) -> Sequence[str] | str
     return value
 
 
+def _read_sources_from_one_path(sources: Sequence[SourceKey], options: Dict[str, Any]) -> List[List[LineupRecord]]:
+    # Worker for the process pool: every source here shares one workbook path
+    books: Dict[str, pd.ExcelFile] = {}
+    try:
+        return [read_lineups_from_source(s, books=books, **options) for s in sources]
+    finally:
+        for book in books.values():
+            book.close()
+
+
 def read_lineups_from_sources(
     sources: Iterable[SourceKey],
     *,
@@ -191,17 +219,28 @@ def read_lineups_from_sources(
     players_col: Optional[str] = None,
     projection_col: str = "Projection",
 ) -> List[LineupRecord]:
+    sources = list(sources)
+    options: Dict[str, Any] = {
+        "default_sheet": default_sheet,
+        "roster_cols": roster_cols,
+        "players_col": players_col,
+        "projection_col": projection_col,
+    }
+    # Group by workbook so each file is opened once; order within a path is kept
+    positions_by_path: Dict[str, List[int]] = {}
+    for pos, s in enumerate(sources):
+        positions_by_path.setdefault(s.path, []).append(pos)
+    groups = [[sources[pos] for pos in positions] for positions in positions_by_path.values()]
+
+    # Small or single-workbook reads stay in-process; larger ones parse each file in its own process
+    results = map_files(_read_sources_from_one_path, list(positions_by_path), groups, [options] * len(groups))
+
+    recs_by_pos: Dict[int, List[LineupRecord]] = {}
+    for positions, per_source in zip(positions_by_path.values(), results):
+        recs_by_pos.update(zip(positions, per_source))
     all_recs: List[LineupRecord] = []
-    for s in sources:
-        all_recs.extend(
-            read_lineups_from_source(
-                s,
-                default_sheet=default_sheet,
-                roster_cols=roster_cols,
-                players_col=players_col,
-                projection_col=projection_col,
-            )
-        )
+    for pos in range(len(sources)):
+        all_recs.extend(recs_by_pos[pos])
     return all_recs
 
 
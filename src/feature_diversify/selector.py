@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
-import math
 import random
 
+import numpy as np
+
 from .io_excel import LineupRecord
 
 
@@ -18,16 +19,58 @@ def jaccard_distance(a: Set[str], b: Set[str]) -> float:
     return 1.0 - (inter / union)
 
 
-def _avg_distance_to_pool(target: Set[str], pool: Sequence[Set[str]]) -> float:
-    if not pool:
-        return 0.0
-    s = 0.0
-    for other in pool:
-        s += jaccard_distance(target, other)
-    return s / float(len(pool))
-
-
-@dataclass
+def _encode_bitmatrix(sets: Sequence[Set[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode sets as rows of a bit-packed uint64 membership matrix; also return set sizes."""
+    vocab: Dict[str, int] = {}
+    for s in sets:
+        for tok in s:
+            vocab.setdefault(tok, len(vocab))
+    bits = np.zeros((len(sets), max(1, (len(vocab) + 63) // 64)), dtype=np.uint64)
+    for i, s in enumerate(sets):
+        if not s:
+            continue
+        idx = np.fromiter((vocab[t] for t in s), dtype=np.uint64, count=len(s))
+        np.bitwise_or.at(bits[i], (idx >> np.uint64(6)).astype(np.intp), np.uint64(1) << (idx & np.uint64(63)))
+    card = np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    return bits, card
+
+
+def _jaccard_rows(bits: np.ndarray, card: np.ndarray, rows: np.ndarray, cols: slice = slice(None)) -> np.ndarray:
+    # Distances from each set in `rows` to every set in `cols`; two empty sets have distance 0
+    inter = np.bitwise_count(bits[rows, None, :] & bits[None, cols, :]).sum(axis=2, dtype=np.int64)
+    union = card[rows, None] + card[None, cols] - inter
+    return np.where(union > 0, 1.0 - inter / np.maximum(union, 1), 0.0)
+
+
+def _distance_row_sums(bits: np.ndarray, card: np.ndarray, block_rows: int = 256) -> np.ndarray:
+    # Row sums of the symmetric distance matrix, evaluating each pair only once:
+    # the diagonal block adds row-wise, the block right of it adds to both sides
+    n = len(card)
+    sums = np.zeros(n, dtype=np.float64)
+    for start in range(0, n, block_rows):
+        end = min(n, start + block_rows)
+        rows = np.arange(start, end)
+        sums[start:end] += _jaccard_rows(bits, card, rows, slice(start, end)).sum(axis=1)
+        if end < n:
+            off = _jaccard_rows(bits, card, rows, slice(end, n))
+            sums[start:end] += off.sum(axis=1)
+            sums[end:] += off.sum(axis=0)
+    return sums
+
+
+def pairwise_jaccard_matrix(sets: Sequence[Set[str]], block_rows: int = 256) -> np.ndarray:
+    """Return the N x N matrix of jaccard_distance between every pair of sets."""
+    bits, card = _encode_bitmatrix(sets)
+    n = len(sets)
+    out = np.empty((n, n), dtype=np.float64)
+    # Row blocks bound the temporary (rows x N x words) intersection array
+    for start in range(0, n, block_rows):
+        rows = np.arange(start, min(n, start + block_rows))
+        out[rows] = _jaccard_rows(bits, card, rows)
+    return out
+
+
+@dataclass(slots=True)
 class SelectionResult:
     selected: List[LineupRecord]
     min_pairwise_jaccard: float
@@ -50,21 +93,22 @@ def farthest_first_with_quotas(
 
     # Precompute sets for speed
     sets: List[Set[str]] = [c.player_tokens for c in pool]
+    bits, card = _encode_bitmatrix(sets)
+    n = len(pool)
 
-    # Seed selection: highest avg distance to the pool (fallback to highest projection)
-    best_idx = -1
-    best_score = -1.0
-    for i, s in enumerate(sets):
-        score = _avg_distance_to_pool(s, sets[:i] + sets[i + 1 :])
-        if score > best_score:
-            best_score = score
-            best_idx = i
-    if best_idx < 0:
-        # Fallback: choose by highest projection
-        best_idx = max(range(len(pool)), key=lambda i: (pool[i].projection or float("-inf"), -pool[i].row_index))
+    def dist_row(i: int) -> np.ndarray:
+        return _jaccard_rows(bits, card, np.array([i]))[0]
+
+    # Average distance from each lineup to the rest of the pool (self-distance is 0)
+    dist_sums = _distance_row_sums(bits, card)
+    avg_to_pool = dist_sums / (n - 1) if n > 1 else np.zeros(n, dtype=np.float64)
+
+    # Seed selection: highest avg distance to the pool (first wins on ties, which are
+    # matched with a tolerance since the sums accumulate in block order)
+    best_idx = int(np.flatnonzero(np.isclose(avg_to_pool, avg_to_pool.max(), rtol=1e-9, atol=0.0))[0])
 
     selected: List[LineupRecord] = []
-    selected_sets: List[Set[str]] = []
+    selected_idx: List[int] = []
     remaining_by_source: Dict[str, int] = dict(quotas_by_source)
 
     def can_take_from(source_key: str) -> bool:
@@ -73,56 +117,52 @@ def farthest_first_with_quotas(
     # Take the seed if its source has quota
     if can_take_from(pool[best_idx].source_key):
         selected.append(pool[best_idx])
-        selected_sets.append(sets[best_idx])
+        selected_idx.append(best_idx)
         remaining_by_source[pool[best_idx].source_key] -= 1
 
-    # Build candidate indices not yet chosen
-    remaining_indices = [i for i in range(len(pool)) if i != best_idx]
-
-    # Greedy iterations
-    while any(v > 0 for v in remaining_by_source.values()):
-        best_i = -1
-        best_min_dist = -1.0
-        best_tiebreak = (float("-inf"), float("inf"))  # (projection, row_index negative)
-
-        for i in remaining_indices:
-            rec = pool[i]
-            if not can_take_from(rec.source_key):
-                continue
-            s = sets[i]
-            if selected_sets:
-                min_dist = min(jaccard_distance(s, t) for t in selected_sets)
-            else:
-                min_dist = _avg_distance_to_pool(s, sets[:i] + sets[i + 1 :])
-
-            proj = rec.projection if rec.projection is not None else float("-inf")
-            tiebreak = (proj, -rec.row_index)
-            if (min_dist > best_min_dist) or (
-                math.isclose(min_dist, best_min_dist) and tiebreak > best_tiebreak
-            ):
-                best_min_dist = min_dist
-                best_tiebreak = tiebreak
-                best_i = i
-
-        if best_i < 0:
-            # No feasible candidate for remaining quotas
-            break
+    # Distance from each lineup to its nearest selected lineup; until something is selected,
+    # candidates are scored by average distance to the pool instead
+    min_dist_to_selected = dist_row(best_idx) if selected_idx else avg_to_pool.copy()
+
+    # Per-candidate arrays for the vectorized scan
+    source_names = list(remaining_by_source.keys())
+    source_pos = {k: j for j, k in enumerate(source_names)}
+    source_id = np.array([source_pos[c.source_key] for c in pool], dtype=np.intp)
+    quota = np.array([remaining_by_source[k] for k in source_names], dtype=np.int64)
+    projection = np.array(
+        [c.projection if c.projection is not None else float("-inf") for c in pool], dtype=np.float64
+    )
+    # Untaken candidates whose source still has quota; whole sources drop out when exhausted
+    eligible = quota[source_id] > 0
+    eligible[best_idx] = False
+
+    # Greedy iterations; stop when no feasible candidate remains for the open quotas
+    while eligible.any():
+        scores = np.where(eligible, min_dist_to_selected, -np.inf)
+        top = scores.max()
+        # Near-ties are broken by (projection, -row_index); first wins if those tie too
+        tied = np.flatnonzero(eligible & np.isclose(scores, top, rtol=1e-9, atol=0.0))
+        best_i = int(max(tied, key=lambda i: (projection[i], -pool[i].row_index)))
 
         # Take the chosen candidate
+        new_row = dist_row(best_i)
+        min_dist_to_selected = np.minimum(min_dist_to_selected, new_row) if selected_idx else new_row
         selected.append(pool[best_i])
-        selected_sets.append(sets[best_i])
-        remaining_by_source[pool[best_i].source_key] -= 1
-        # Remove from remaining indices
-        remaining_indices = [i for i in remaining_indices if i != best_i]
+        selected_idx.append(best_i)
+        eligible[best_i] = False
+        src = source_id[best_i]
+        quota[src] -= 1
+        if quota[src] == 0:
+            eligible[source_id == src] = False
 
     # Compute metrics
-    if len(selected_sets) >= 2:
-        dists: List[float] = []
-        for i in range(len(selected_sets)):
-            for j in range(i + 1, len(selected_sets)):
-                dists.append(jaccard_distance(selected_sets[i], selected_sets[j]))
-        min_j = min(dists) if dists else float("nan")
-        avg_j = sum(dists) / len(dists) if dists else float("nan")
+    if len(selected_idx) >= 2:
+        # Pairwise distances among the selected rows only (S x S, not S x N)
+        sel = np.array(selected_idx)
+        pair = _jaccard_rows(bits[sel], card[sel], np.arange(len(sel)))
+        dists = pair[np.triu_indices(len(sel), k=1)]
+        min_j = float(dists.min())
+        avg_j = float(dists.mean())
     else:
         min_j = float("nan")
         avg_j = float("nan")
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import logging
+import math
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterable, List, Optional, Sequence, TypeVar
 
+import numpy as np
+import orjson
 import pandas as pd
-import json
 
-from .logging_utils import setup_logger
+logger = logging.getLogger(__name__)
 
-logger = setup_logger(__name__)
+_T = TypeVar("_T")
 
 
-@dataclass
+@dataclass(slots=True)
 class ExcelWorkbookPaths:
     unfiltered: str
     filtered: str
@@ -37,6 +44,95 @@ def write_csv(df: pd.DataFrame, path: str) -> None:
     logger.info("Wrote CSV: %s rows=%d cols=%d", path, len(df), df.shape[1])
 
 
+# xlsxwriter options for streamed sheets: constant_memory flushes each row to disk as soon as the
+# next one starts, and string cells are written verbatim (no number/URL/formula sniffing per cell)
+XLSX_WRITE_OPTIONS = {
+    "constant_memory": True,
+    "strings_to_numbers": False,
+    "strings_to_urls": False,
+    "strings_to_formulas": False,
+}
+
+
+# Number formats pandas' to_excel gives datetime and date cells
+_DATETIME_NUM_FORMAT = "YYYY-MM-DD HH:MM:SS"
+_DATE_NUM_FORMAT = "YYYY-MM-DD"
+# The header style pandas 2.x to_excel applied (bold, thin border, centered)
+_HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+
+
+def _excel_cell(value: Any) -> Any:
+    # xlsxwriter rejects NaN/inf and container types; mirror pandas' to_excel coercions
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, np.datetime64):
+        # .item() would give an int for ns precision; go through Timestamp (NaT stays NaT)
+        value = pd.Timestamp(value)
+    elif isinstance(value, np.generic):
+        value = value.item()
+        if isinstance(value, (str, bool, int)):
+            return value
+    if isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if math.isinf(value):
+            return "inf" if value > 0 else "-inf"
+        return value
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, date):
+        # Excel has no time zones, so only naive datetimes are written as dates
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            return str(value)
+        return value.to_pydatetime() if isinstance(value, pd.Timestamp) else value
+    return str(value)
+
+
+def _excel_column(values: pd.Series) -> list:
+    # Coerce a whole column at once; plain numpy int/bool/finite-float columns need no per-cell work
+    cells = values.tolist()
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in "iub":
+            return cells
+        if dtype.kind == "f" and np.isfinite(values.to_numpy()).all():
+            return cells
+    return [_excel_cell(v) for v in cells]
+
+
+def write_sheet_rows(writer: pd.ExcelWriter, sheet_name: str, df: pd.DataFrame) -> None:
+    """Write ``df`` to a new xlsxwriter sheet one row at a time (no index).
+
+    Rows are emitted in order, so this works with ``constant_memory`` workbooks
+    where pandas' column-wise ``to_excel`` would drop cells. Datetime and date
+    cells get the same number formats ``to_excel`` uses.
+    """
+    columns = [_excel_column(df.iloc[:, i]) for i in range(df.shape[1])]
+    ws = writer.book.add_worksheet(sheet_name)
+    ws.write_row(0, 0, [str(c) for c in df.columns], writer.book.add_format(_HEADER_FORMAT))
+    # Only datetime64/object columns can hold dates; everything else goes out via write_row alone
+    date_cols = [
+        i for i, cells in enumerate(columns)
+        if isinstance(df.dtypes.iloc[i], np.dtype) and df.dtypes.iloc[i].kind in "MO"
+        and any(isinstance(v, date) for v in cells)
+    ]
+    if not date_cols:
+        for r, row in enumerate(zip(*columns), start=1):
+            ws.write_row(r, 0, row)
+        return
+    datetime_fmt = writer.book.add_format({"num_format": _DATETIME_NUM_FORMAT})
+    date_fmt = writer.book.add_format({"num_format": _DATE_NUM_FORMAT})
+    for r, row in enumerate(zip(*columns), start=1):
+        ws.write_row(r, 0, row)
+        for c in date_cols:
+            v = row[c]
+            if isinstance(v, date):
+                # Rewrite the cell in place with its number format (same row, so constant_memory keeps it)
+                ws.write_datetime(r, c, v, datetime_fmt if isinstance(v, datetime) else date_fmt)
+
+
 def write_excel_with_tabs(
     projections_df: pd.DataFrame,
     params_df: pd.DataFrame,
@@ -46,19 +142,21 @@ def write_excel_with_tabs(
     extra_tabs: Optional[dict[str, pd.DataFrame]] = None,
 ) -> None:
     ensure_dir(path)
-    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
-        projections_df.to_excel(writer, sheet_name="Projections", index=False)
-        params_df.to_excel(writer, sheet_name="Parameters", index=False)
-        lineups_df.to_excel(writer, sheet_name="Lineups", index=False)
+    engine_kwargs = {"options": dict(XLSX_WRITE_OPTIONS)}
+    with pd.ExcelWriter(path, engine="xlsxwriter", engine_kwargs=engine_kwargs) as writer:
+        write_sheet_rows(writer, "Projections", projections_df)
+        write_sheet_rows(writer, "Parameters", params_df)
+        write_sheet_rows(writer, "Lineups", lineups_df)
         if players_df is not None:
-            players_df.to_excel(writer, sheet_name="Players", index=False)
+            write_sheet_rows(writer, "Players", players_df)
         if extra_tabs:
             for sheet_name, df in extra_tabs.items():
                 try:
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+                    write_sheet_rows(writer, sheet_name, df)
                 except Exception:
                     # If anything goes wrong, write an empty sheet to avoid breaking the export
-                    pd.DataFrame().to_excel(writer, sheet_name=sheet_name, index=False)
+                    if sheet_name not in writer.book.sheetnames:
+                        writer.book.add_worksheet(sheet_name)
     tabs = ["Projections", "Parameters", "Lineups"]
     if players_df is not None:
         tabs.append("Players")
@@ -67,10 +165,90 @@ def write_excel_with_tabs(
     logger.info("Wrote Excel workbook: %s (tabs: %s)", path, ", ".join(tabs))
 
 
+# Below this much workbook data, spawning reader processes costs more than it saves
+PARALLEL_READ_MIN_BYTES = 4 * 1024 * 1024
+
+
+def total_file_size(paths: Iterable[str]) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def map_files(fn: Callable[..., _T], paths: Sequence[str], *iterables: Iterable[Any]) -> List[_T]:
+    """Return [fn(*args) for args in zip(*iterables)], one call per file in paths, in order.
+
+    Workbook parsing is GIL-bound, so when there are at least two files and
+    PARALLEL_READ_MIN_BYTES of data the calls run in separate processes. spawn avoids forking a
+    parent that may already be running threads; fn must be importable at module level.
+    """
+    workers = min(len(paths), os.cpu_count() or 1)
+    if workers < 2 or total_file_size(paths) < PARALLEL_READ_MIN_BYTES:
+        return [fn(*args) for args in zip(*iterables)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+        return list(ex.map(fn, *iterables))
+
+
+# Schema metadata key stamping a Parquet sidecar with the workbook (name, size, mtime) and sheet
+# it mirrors; sidecars without a matching stamp (e.g. `aggregate --out X.parquet`) are ignored
+_SIDECAR_META_KEY = b"dfs_optimizer.sidecar"
+
+
+def parquet_sidecar_path(xlsx_path: str) -> str:
+    """Path of the Parquet copy of a workbook sheet (same stem, .parquet suffix)."""
+    return os.path.splitext(xlsx_path)[0] + ".parquet"
+
+
+def _sidecar_stamp(xlsx_path: str, sheet_name: str) -> bytes:
+    st = os.stat(xlsx_path)
+    return orjson.dumps({
+        "source": os.path.basename(xlsx_path),
+        "sheet": sheet_name,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    })
+
+
+def write_parquet_sidecar(xlsx_path: str, sheet_name: str, df: pd.DataFrame) -> str:
+    """Write df as the Parquet sidecar of sheet_name in the (already written) workbook xlsx_path."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = parquet_sidecar_path(xlsx_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_SIDECAR_META_KEY] = _sidecar_stamp(xlsx_path, sheet_name)
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+    logger.info("Wrote Parquet sidecar: %s rows=%d", path, len(df))
+    return path
+
+
+def read_parquet_sidecar(xlsx_path: str, sheet_name: str) -> Optional[pd.DataFrame]:
+    """Return sheet_name of xlsx_path from its Parquet sidecar, or None when there is no sidecar
+    written for exactly this workbook and sheet."""
+    path = parquet_sidecar_path(xlsx_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow.parquet as pq
+
+        metadata = pq.read_schema(path).metadata or {}
+        if metadata.get(_SIDECAR_META_KEY) != _sidecar_stamp(xlsx_path, sheet_name):
+            return None
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+
 def write_json(obj, path: str) -> None:
     ensure_dir(path)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2)
+    data = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+    with open(path, "wb") as f:
+        f.write(data)
     logger.info("Wrote JSON: %s", path)
 
 
@@ -8,7 +8,7 @@ import pandas as pd
 ALLOWED_POSITIONS = {"QB", "RB", "WR", "TE", "DST"}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Player:
     name: str
     team: str
@@ -22,7 +22,7 @@ class Player:
         return f"{self.name} ({self.team})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Parameters:
     lineup_count: int = 5000
     min_salary: int = 45000
@@ -97,24 +97,36 @@ def game_key(team: str, opponent: str) -> str:
     return "-".join(parts)
 
 
+def _upper_codes(values: pd.Series) -> List[str]:
+    # Team/opponent/position have only a handful of distinct values: upper-case each once
+    # and expand by code, like a categorical, instead of str().upper() per row
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    upper = [str(u).upper() for u in uniques]
+    return [upper[k] for k in codes]
+
+
 def players_from_df(df: pd.DataFrame) -> List[Player]:
     required = ["Name", "Team", "Opponent", "Position", "Salary", "Projection", "Ownership"]
     missing = [c for c in required if c not in df.columns]
     assert not missing, f"Missing columns for players: {missing}"
 
+    # Pull each column once and zip; iterrows would build a Series per row
+    names, salaries, projections, ownerships = (df[c].tolist() for c in ("Name", "Salary", "Projection", "Ownership"))
+    teams, opponents, positions = (_upper_codes(df[c]) for c in ("Team", "Opponent", "Position"))
     players: List[Player] = []
-    for _, row in df.iterrows():
-        position = str(row["Position"]).upper()
+    for name, team, opponent, position, salary, projection, ownership in zip(
+        names, teams, opponents, positions, salaries, projections, ownerships
+    ):
         assert position in ALLOWED_POSITIONS, f"Invalid position: {position}"
-        salary = int(row["Salary"])  # may raise if NaN; desired
-        projection = float(row["Projection"])
-        ownership = float(row["Ownership"])
+        salary = int(salary)  # may raise if NaN; desired
+        projection = float(projection)
+        ownership = float(ownership)
         assert 0 <= ownership <= 1, "Ownership must be fraction in [0,1]"
         players.append(
             Player(
-                name=str(row["Name"]),
-                team=str(row["Team"]).upper(),
-                opponent=str(row["Opponent"]).upper(),
+                name=str(name),
+                team=team,
+                opponent=opponent,
                 position=position,
                 salary=salary,
                 projection=projection,
@@ -1,19 +1,20 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 import os
 from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 import pulp
 
 from .models import Player, Parameters, game_key
-from .logging_utils import setup_logger
 
-logger = setup_logger(__name__)
+logger = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LineupResult:
     players: Tuple[Player, ...]
     total_projection: float
@@ -161,19 +162,32 @@ def compute_stack_positions(players: List[Player]) -> Tuple[Tuple[str, ...], int
     return positions_sorted, max_game, max_game_key, stack_count, all_games_sorted, rb_dst
 
 
+def _make_solver(solver_kwargs: Dict[str, object]) -> Tuple[pulp.LpSolver, str]:
+    # Prefer in-process HiGHS (highspy) when installed: each uniqueness re-solve then skips
+    # CBC's subprocess launch and LP file round-trip. CBC ships with PuLP as the fallback.
+    highs = pulp.HiGHS(**solver_kwargs)
+    if highs.available():
+        return highs, "HiGHS"
+    return pulp.PULP_CBC_CMD(**solver_kwargs), "CBC"
+
+
 def generate_lineups(players: List[Player], params: Parameters, max_lineups: int | None = None) -> List[LineupResult]:
     params.validate()
     target_lineups = max_lineups or params.lineup_count
 
-    # Preindex players by position and attributes
+    # Column (struct-of-arrays) views of the pool, read once and shared by the index
+    # builders, the model coefficients and the per-lineup totals below
     index = list(range(len(players)))
-    pos_idxs = {
-        "QB": [i for i, p in enumerate(players) if p.position == "QB"],
-        "RB": [i for i, p in enumerate(players) if p.position == "RB"],
-        "WR": [i for i, p in enumerate(players) if p.position == "WR"],
-        "TE": [i for i, p in enumerate(players) if p.position == "TE"],
-        "DST": [i for i, p in enumerate(players) if p.position == "DST"],
-    }
+    names = [p.name for p in players]
+    teams = [p.team for p in players]
+    opponents = [p.opponent for p in players]
+    positions = [p.position for p in players]
+    projection_coef = [p.projection for p in players]
+    salary_coef = [p.salary for p in players]
+    ownership_coef = [p.ownership for p in players]
+
+    # Preindex players by position and attributes
+    pos_idxs: Dict[str, List[int]] = {"QB": [], "RB": [], "WR": [], "TE": [], "DST": []}
 
     # Precompute sets
     team_to_qb_idxs: Dict[str, List[int]] = {}
@@ -184,39 +198,46 @@ def generate_lineups(players: List[Player], params: Parameters, max_lineups: int
     dst_opp_to_idxs: Dict[str, List[int]] = {}
     name_to_idxs: Dict[str, List[int]] = {}
 
-    for i, p in enumerate(players):
-        if p.position == "QB":
-            team_to_qb_idxs.setdefault(p.team, []).append(i)
-        if p.position in {"WR", "TE"}:
-            team_to_wrte_idxs.setdefault(p.team, []).append(i)
-        if p.position == "RB":
-            team_to_rb_idxs.setdefault(p.team, []).append(i)
-        team_to_all_idxs.setdefault(p.team, []).append(i)
-        if p.position == "DST":
-            dst_opp_to_idxs.setdefault(p.opponent, []).append(i)
+    for i, (name, team, opponent, position) in enumerate(zip(names, teams, opponents, positions)):
+        if position in pos_idxs:
+            pos_idxs[position].append(i)
+        if position == "QB":
+            team_to_qb_idxs.setdefault(team, []).append(i)
+        if position in {"WR", "TE"}:
+            team_to_wrte_idxs.setdefault(team, []).append(i)
+        if position == "RB":
+            team_to_rb_idxs.setdefault(team, []).append(i)
+        team_to_all_idxs.setdefault(team, []).append(i)
+        if position == "DST":
+            dst_opp_to_idxs.setdefault(opponent, []).append(i)
         # Exclude DST from game stack constraints
-        if p.position != "DST":
-            game_to_idxs.setdefault(game_key(p.team, p.opponent), []).append(i)
-        name_to_idxs.setdefault(p.name, []).append(i)
+        if position != "DST":
+            game_to_idxs.setdefault(game_key(team, opponent), []).append(i)
+        name_to_idxs.setdefault(name, []).append(i)
 
     lineups: List[LineupResult] = []
     previous_solutions: List[List[int]] = []
 
-    # Configure CBC solver (threads/time limit) once per run
+    # Configure the solver (threads/time limit) once per run
     effective_threads = params.solver_threads if params.solver_threads is not None else (os.cpu_count() or 1)
     effective_time_limit = float(params.solver_time_limit_s) if params.solver_time_limit_s is not None else None
     solver_kwargs: Dict[str, object] = {"msg": False, "threads": int(effective_threads)}
     if effective_time_limit is not None:
         solver_kwargs["timeLimit"] = effective_time_limit
-    solver_cmd = pulp.PULP_CBC_CMD(**solver_kwargs)
-    logger.info("Solver settings: CBC threads=%d timeLimit=%s", int(effective_threads), str(effective_time_limit))
+    solver_cmd, solver_name = _make_solver(solver_kwargs)
+    logger.info("Solver settings: %s threads=%d timeLimit=%s", solver_name, int(effective_threads), str(effective_time_limit))
 
     # Build the MILP once
     prob = pulp.LpProblem("DFS_Optimizer", pulp.LpMaximize)
     x = pulp.LpVariable.dicts("x", index, lowBound=0, upBound=1, cat="Binary")
+    x_list = [x[i] for i in index]
+
+    def linear(coeffs: List[float]) -> pulp.LpAffineExpression:
+        # One pass over (variable, coefficient) pairs; lpSum would build a term per product
+        return pulp.LpAffineExpression(list(zip(x_list, coeffs)))
 
     # Objective: maximize projection
-    prob += pulp.lpSum(players[i].projection * x[i] for i in index)
+    prob += linear(projection_coef)
 
     # Roster size and position counts
     prob += pulp.lpSum(x[i] for i in index) == 9
@@ -227,36 +248,36 @@ def generate_lineups(players: List[Player], params: Parameters, max_lineups: int
     prob += pulp.lpSum(x[i] for i in pos_idxs["TE"]) >= 1
 
     # Salary bounds
-    prob += pulp.lpSum(players[i].salary * x[i] for i in index) <= 50000
-    prob += pulp.lpSum(players[i].salary * x[i] for i in index) >= params.min_salary
+    prob += linear(salary_coef) <= 50000
+    prob += linear(salary_coef) >= params.min_salary
 
     # Lineup-level projection bounds
     if params.min_sum_projection is not None:
-        prob += pulp.lpSum(players[i].projection * x[i] for i in index) >= float(params.min_sum_projection)
+        prob += linear(projection_coef) >= float(params.min_sum_projection)
     if getattr(params, "max_sum_projection", None) is not None:
-        prob += pulp.lpSum(players[i].projection * x[i] for i in index) <= float(params.max_sum_projection)
+        prob += linear(projection_coef) <= float(params.max_sum_projection)
 
     # Ownership sum bounds (treat ownership as fraction)
     if params.min_sum_ownership is not None:
-        prob += pulp.lpSum(players[i].ownership * x[i] for i in index) >= float(params.min_sum_ownership)
+        prob += linear(ownership_coef) >= float(params.min_sum_ownership)
     if params.max_sum_ownership is not None:
-        prob += pulp.lpSum(players[i].ownership * x[i] for i in index) <= float(params.max_sum_ownership)
+        prob += linear(ownership_coef) <= float(params.max_sum_ownership)
 
     # Ownership product bounds via log transform: sum(log(max(ownership, eps)) * x) bounds
     import math
     eps = 1e-6
-    log_ownership = {i: math.log(max(players[i].ownership, eps)) for i in index}
+    log_ownership = np.log(np.maximum(np.asarray(ownership_coef, dtype=np.float64), eps)).tolist()
     if params.min_product_ownership is not None:
-        prob += pulp.lpSum(log_ownership[i] * x[i] for i in index) >= math.log(max(params.min_product_ownership, eps))
+        prob += linear(log_ownership) >= math.log(max(params.min_product_ownership, eps))
     if params.max_product_ownership is not None:
-        prob += pulp.lpSum(log_ownership[i] * x[i] for i in index) <= math.log(max(params.max_product_ownership, eps))
+        prob += linear(log_ownership) <= math.log(max(params.max_product_ownership, eps))
 
     # Weighted ownership bounds (linear): sum((salary/50000) * ownership * x) bounds
-    weighted_coeff = {i: (players[i].salary / 50000.0) * players[i].ownership for i in index}
+    weighted_coeff = [(sal / 50000.0) * own for sal, own in zip(salary_coef, ownership_coef)]
     if params.min_weighted_ownership is not None:
-        prob += pulp.lpSum(weighted_coeff[i] * x[i] for i in index) >= float(params.min_weighted_ownership)
+        prob += linear(weighted_coeff) >= float(params.min_weighted_ownership)
     if params.max_weighted_ownership is not None:
-        prob += pulp.lpSum(weighted_coeff[i] * x[i] for i in index) <= float(params.max_weighted_ownership)
+        prob += linear(weighted_coeff) <= float(params.max_weighted_ownership)
 
     # Exclusions by player name
     if params.excluded_players:
@@ -341,7 +362,7 @@ def generate_lineups(players: List[Player], params: Parameters, max_lineups: int
     if params.rb_dst_stack:
         for t, dst_idxs in team_to_all_idxs.items():
             # Filter DST indices for team t
-            dst_idxs_t = [i for i in dst_idxs if players[i].position == "DST"]
+            dst_idxs_t = [i for i in dst_idxs if positions[i] == "DST"]
             rb_idxs_t = team_to_rb_idxs.get(t, [])
             if not dst_idxs_t:
                 continue
@@ -384,7 +405,8 @@ def generate_lineups(players: List[Player], params: Parameters, max_lineups: int
             logger.info("No more optimal solutions found (status=%s)", pulp.LpStatus[status])
             break
 
-        selected_idxs = [i for i in index if x[i].value() == 1]
+        # Read solution values straight off the variable list (binaries: round at 0.5)
+        selected_idxs = [i for i, var in zip(index, x_list) if (var.varValue or 0.0) > 0.5]
         assert len(selected_idxs) == 9
         selected_players = [players[i] for i in selected_idxs]
 
@@ -395,15 +417,16 @@ def generate_lineups(players: List[Player], params: Parameters, max_lineups: int
         assert sum(1 for p in selected_players if p.position == "WR") >= 3
         assert sum(1 for p in selected_players if p.position == "TE") >= 1
 
-        total_salary = sum(p.salary for p in selected_players)
+        # Gather from the coefficient columns; sums run in the same order as before so
+        # totals (and therefore lineup ranking) are bit-for-bit unchanged
+        total_salary = sum([salary_coef[i] for i in selected_idxs])
         assert params.min_salary <= total_salary <= 50000
 
-        total_projection = sum(p.projection for p in selected_players)
-        sum_ownership = sum(p.ownership for p in selected_players)
-        product_ownership = 1.0
-        for p in selected_players:
-            product_ownership *= max(p.ownership, 1e-9)
-        weighted_ownership = sum((p.salary / 50000.0) * p.ownership for p in selected_players)
+        total_projection = sum([projection_coef[i] for i in selected_idxs])
+        selected_ownership = [ownership_coef[i] for i in selected_idxs]
+        sum_ownership = sum(selected_ownership)
+        product_ownership = math.prod([max(own, 1e-9) for own in selected_ownership], start=1.0)
+        weighted_ownership = sum([weighted_coeff[i] for i in selected_idxs])
 
         stack_positions, max_game_stack, max_game_key, stack_count, all_game_stacks, rb_dst_stack = compute_stack_positions(selected_players)
         # Bringback diagnostic: WR/TE from opponent of the QB
@@ -432,7 +455,7 @@ def generate_lineups(players: List[Player], params: Parameters, max_lineups: int
         previous_solutions.append(selected_idxs)
 
         # Add uniqueness constraint to avoid reproducing the same lineup
-        prob += pulp.lpSum(x[i] for i in selected_idxs) <= 8
+        prob += pulp.LpAffineExpression([(x_list[i], 1) for i in selected_idxs]) <= 8
 
     return lineups
 
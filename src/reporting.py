@@ -3,11 +3,13 @@ from __future__ import annotations
 import dataclasses
 from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .models import Parameters
 from .io_utils import write_excel_with_tabs
 from .dk_upload import (
+    BASE_NAME_RE,
     load_dk_entries,
     format_lineups_for_dk,
     build_name_to_id_map_from_projections,
@@ -39,7 +41,7 @@ def build_parameters_df(params: Parameters) -> pd.DataFrame:
         "solver_time_limit_s",
     ]
     # New layout: one parameter per row
-    rows = []
+    values = []
     for k in ordered_keys:
         v = data.get(k)
         # Convert collections to readable strings
@@ -47,8 +49,9 @@ def build_parameters_df(params: Parameters) -> pd.DataFrame:
             v = ", ".join(sorted(v))
         elif isinstance(v, dict):
             v = ", ".join(f"{kk}:{vv}" for kk, vv in sorted(v.items()))
-        rows.append({"Parameter": k, "Value": v})
-    return pd.DataFrame(rows, columns=["Parameter", "Value"])
+        values.append(v)
+    # Mixed-type values stay as-is in an object column; no per-row dict inference
+    return pd.DataFrame({"Parameter": ordered_keys, "Value": pd.Series(values, dtype=object)})
 
 
 def export_workbook(
@@ -87,6 +90,9 @@ def export_workbook(
     write_excel_with_tabs(projections_df, params_df, lineups_df, path, players_df=players_df, extra_tabs=extra_tabs or None)
 
 
+_SLOT_COLS = ("QB", "RB1", "RB2", "WR1", "WR2", "WR3", "TE", "FLEX", "DST")
+
+
 def build_players_exposure_df(
     lineups_df: pd.DataFrame,
     projections_df: pd.DataFrame,
@@ -95,64 +101,60 @@ def build_players_exposure_df(
 ) -> pd.DataFrame:
     if lineups_df is None or lineups_df.empty:
         return pd.DataFrame({"Player": [], "Position": [], "Team": [], "# Lineups": [], "% Lineups": [], "Start Time": []})
-    player_cols = ["QB", "RB1", "RB2", "WR1", "WR2", "WR3", "TE", "FLEX", "DST"]
-    present_cols = [c for c in player_cols if c in lineups_df.columns]
+    present_cols = [c for c in _SLOT_COLS if c in lineups_df.columns]
     if not present_cols:
         return pd.DataFrame({"Player": [], "Position": [], "Team": [], "# Lineups": [], "% Lineups": [], "Start Time": []})
 
     # Extract player names by stripping any trailing parenthetical (team or ownership)
-    def extract_name(value: str) -> str:
-        s = str(value)
-        if s.endswith(")") and "(" in s:
-            try:
-                name_part = s.rsplit(" (", 1)[0]
-                return name_part
-            except Exception:
-                return s
-        return s
-
+    # One object buffer for every slot cell instead of a Series per column
+    cells = pd.Series(lineups_df[present_cols].to_numpy(dtype=object).ravel()).dropna().astype(str)
+    names = cells.str.extract(BASE_NAME_RE, expand=False).fillna(cells)
     # Build counts keyed by player name only
-    name_series = pd.Series(dtype=object)
-    for c in present_cols:
-        col = lineups_df[c].dropna().astype(str).apply(extract_name)
-        name_series = pd.concat([name_series, col], ignore_index=True)
-    counts = name_series.value_counts()
+    counts = names.value_counts()
     total_lineups = max(1, len(lineups_df))
 
     # Map name to (position, team) using projections_df
-    proj = projections_df.copy()
-    proj["Team"] = proj["Team"].astype(str).str.upper().str.strip()
-    proj["Name"] = proj["Name"].astype(str)
-    # If duplicate names exist, we take the first occurrence
-    name_to_pos = proj.groupby("Name")["Position"].first()
-    name_to_team = proj.groupby("Name")["Team"].first()
-
-    records = []
-    for name, cnt in counts.items():
-        pos = name_to_pos.get(name, "")
-        team = name_to_team.get(name, "")
-        pct = int(round(cnt / total_lineups * 100))
-        # Look up start time using (NAME, TEAM) with uppercase matching
-        start_str = ""
-        if start_time_map is not None and team:
-            key = (str(name).upper().strip(), str(team).upper().strip())
-            epoch = start_time_map.get(key)
-            if epoch is not None:
+    proj_names = projections_df["Name"].astype(str)
+    proj_teams = projections_df["Team"].astype(str).str.upper().str.strip()
+    # If duplicate names exist, we take the first occurrence; a duplicated() mask picks those
+    # rows without building a GroupBy, and plain dicts serve the per-player loop
+    first = ~proj_names.duplicated(keep="first")
+    first_names = proj_names[first].tolist()
+    name_to_pos = dict(zip(first_names, projections_df["Position"][first].tolist()))
+    name_to_team = dict(zip(first_names, proj_teams[first].tolist()))
+    # Many players share a kickoff, so format each distinct epoch once
+    start_str_by_epoch: Dict[Any, str] = {}
+
+    # Everything below is per distinct player, not per lineup cell
+    players = counts.index.tolist()
+    n_lineups = counts.to_numpy()
+    teams = [name_to_team.get(name, "") for name in players]
+    start_strs = [""] * len(players)
+    if start_time_map is not None:
+        for i, (name, team) in enumerate(zip(players, teams)):
+            if not team:
+                continue
+            # Look up start time using (NAME, TEAM) with uppercase matching
+            epoch = start_time_map.get((str(name).upper().strip(), str(team).upper().strip()))
+            if epoch is None:
+                continue
+            if epoch not in start_str_by_epoch:
                 try:
-                    ts = pd.to_datetime(int(epoch), unit="s", utc=True).tz_convert("US/Eastern")
-                    start_str = ts.strftime("%Y-%m-%d %H:%M ET")
+                    ts = pd.Timestamp(int(epoch), unit="s", tz="UTC").tz_convert("US/Eastern")
+                    start_str_by_epoch[epoch] = ts.strftime("%Y-%m-%d %H:%M ET")
                 except Exception:
-                    start_str = ""
-        records.append({
-            "Player": name,
-            "Position": pos,
-            "Team": team,
-            "# Lineups": int(cnt),
-            "% Lineups": pct,
-            "Start Time": start_str,
-        })
-
-    out = pd.DataFrame.from_records(records)
+                    start_str_by_epoch[epoch] = ""
+            start_strs[i] = start_str_by_epoch[epoch]
+
+    out = pd.DataFrame({
+        "Player": players,
+        "Position": [name_to_pos.get(name, "") for name in players],
+        "Team": teams,
+        "# Lineups": n_lineups.astype(np.int64),
+        # np.rint rounds half to even, exactly like round()
+        "% Lineups": np.rint(n_lineups / total_lineups * 100).astype(np.int64),
+        "Start Time": start_strs,
+    })
     out = out.sort_values(by=["# Lineups", "Player"], ascending=[False, True]).reset_index(drop=True)
     return out
 
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import csv
+import logging
 import glob
 import os
 from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from .logging_utils import setup_logger
-from .data_loader import normalize_ownership
+from .data_loader import normalize_ownership_array
 
-logger = setup_logger(__name__)
+logger = logging.getLogger(__name__)
 
 
 def find_latest_sabersim_csv(directory: str = "data/", prefix: str = "NFL_") -> str:
@@ -20,8 +22,8 @@ def find_latest_sabersim_csv(directory: str = "data/", prefix: str = "NFL_") ->
         raise FileNotFoundError(
             f"No SaberSim CSV files found matching '{pattern}'. Place an '{prefix}*.csv' under {directory}."
         )
-    candidates.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-    latest = candidates[0]
+    # Only the newest file is needed: one stat per candidate, no sort
+    latest = max(candidates, key=os.path.getmtime)
     logger.info("Using SaberSim CSV: %s", latest)
     return latest
 
@@ -30,26 +32,51 @@ def _normalize_headers(columns: List[str]) -> List[str]:
     return [str(c).strip() for c in columns]
 
 
+def _upper_strip(values: pd.Series, suffix: str = "") -> pd.Series:
+    # Team/Opponent/Position repeat a handful of values: run the string chain over the
+    # distinct values only, then expand by code (missing values stay missing)
+    codes, uniques = pd.factorize(values)
+    norm = pd.Series(uniques, dtype=object).astype(str).str.upper().str.strip()
+    if suffix:
+        norm = norm.str.removesuffix(suffix)
+    lookup = np.append(norm.to_numpy(dtype=object), np.nan)
+    return pd.Series(lookup[codes], index=values.index, dtype="str")
+
+
 def _coerce_numeric(series: pd.Series) -> pd.Series:
     return pd.to_numeric(series, errors="coerce")
 
 
+# Canonical column -> accepted SaberSim headers, in preference order
+_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "Name": ("Name",),
+    "Team": ("Team",),
+    "Opponent": ("Opponent", "Opp"),
+    "Position": ("Position", "Pos"),
+    "Salary": ("Salary",),
+    "Projection": ("SS Proj",),
+    "Ownership": ("Adj Own",),
+    "DFS ID": ("DFS ID",),
+}
+
+
+def _read_alias_columns(path: str) -> pd.DataFrame:
+    # SaberSim exports carry dozens of columns; parse only the ones an alias can match
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f), [])
+    wanted = {c for names in _ALIASES.values() for c in names}
+    usecols = list(dict.fromkeys(c for c in header if c.strip() in wanted))
+    if not usecols:
+        return pd.DataFrame()
+    return pd.read_csv(path, usecols=usecols, engine="pyarrow")
+
+
 def load_and_clean_sabersim_csv(path: str) -> pd.DataFrame:
     assert os.path.exists(path), f"Input file not found: {path}"
-    df = pd.read_csv(path)
+    df = _read_alias_columns(path)
     df.columns = _normalize_headers(list(df.columns))
 
-    # Column aliases
-    aliases: Dict[str, Tuple[str, ...]] = {
-        "Name": ("Name",),
-        "Team": ("Team",),
-        "Opponent": ("Opponent", "Opp"),
-        "Position": ("Position", "Pos"),
-        "Salary": ("Salary",),
-        "Projection": ("SS Proj",),
-        "Ownership": ("Adj Own",),
-        "DFS ID": ("DFS ID",),
-    }
+    aliases = _ALIASES
 
     def pick(colnames: Tuple[str, ...]) -> str | None:
         for c in colnames:
@@ -77,17 +104,16 @@ def load_and_clean_sabersim_csv(path: str) -> pd.DataFrame:
 
     out = pd.DataFrame()
     out["Name"] = df[mapping["Name"]].astype(str)
-    out["Team"] = df[mapping["Team"]].astype(str).str.upper().str.strip()
-    out["Opponent"] = df[mapping["Opponent"]].astype(str).str.upper().str.strip()
-    out["Position"] = df[mapping["Position"]].astype(str).str.upper().str.strip()
+    out["Team"] = _upper_strip(df[mapping["Team"]])
+    out["Opponent"] = _upper_strip(df[mapping["Opponent"]])
     # SaberSim may label skill positions as 'RB/FLEX', 'WR/FLEX', 'TE/FLEX'.
     # Trim the '/FLEX' suffix to align with allowed positions.
-    out["Position"] = out["Position"].str.replace(r"/FLEX$", "", regex=True)
-    out["Salary"] = _coerce_numeric(df[mapping["Salary"]])
-    out["Projection"] = _coerce_numeric(df[mapping["Projection"]])
-    out["Ownership"] = _coerce_numeric(df[mapping["Ownership"]])
-    # Normalize ownership to 0..1
-    out["Ownership"] = normalize_ownership(out["Ownership"])
+    out["Position"] = _upper_strip(df[mapping["Position"]], suffix="/FLEX")
+    # Coerce the numeric columns in one sweep, then normalize ownership to 0..1 on the array
+    nums = df[[mapping["Salary"], mapping["Projection"], mapping["Ownership"]]].apply(_coerce_numeric)
+    out["Salary"] = nums.iloc[:, 0]
+    out["Projection"] = nums.iloc[:, 1]
+    out["Ownership"] = normalize_ownership_array(nums.iloc[:, 2].to_numpy(dtype=np.float64))
 
     # Carry-through DFS ID for DK mapping override (optional)
     if "DFS ID" in mapping:
@@ -1,18 +1,39 @@
 from __future__ import annotations
 
 import os
-import glob
-import json
-from typing import Dict, Tuple, Optional, List, Set
+from typing import Dict, Iterable, Tuple, Optional, List, Set
 from datetime import datetime, timezone
+from functools import lru_cache
 
+import numpy as np
+import orjson
 import pandas as pd
 
 
+def _read_json(path: str) -> object:
+    # The CLI reads the same draftables file for start times and for the games table;
+    # key the cache on mtime/size so an edited file is re-read. Callers must not mutate it.
+    st = os.stat(path)
+    return _read_json_cached(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=4)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> object:
+    # orjson parses the (multi-MB) draftables dumps several times faster than stdlib json
+    with open(path, "rb") as fh:
+        return orjson.loads(fh.read())
+
+
 def find_single_json_in_data(data_dir: str = "data/") -> Optional[str]:
-    # Find JSON files directly under the data directory (non-recursive)
-    pattern = os.path.join(data_dir, "*.json")
-    files_all = sorted(glob.glob(pattern))
+    # Find JSON files directly under the data directory (non-recursive); one scandir pass
+    # reads names without glob's pattern translation (dotfiles skipped, as glob would)
+    try:
+        with os.scandir(data_dir) as it:
+            files_all = sorted(
+                os.path.join(data_dir, e.name) for e in it if e.name.endswith(".json") and not e.name.startswith(".")
+            )
+    except OSError:
+        return None
     if len(files_all) == 0:
         return None
     # Ignore the contests index; we want the draftables (slate) JSON
@@ -23,8 +44,7 @@ def find_single_json_in_data(data_dir: str = "data/") -> Optional[str]:
         # Prefer files that look like true draftables JSON (contain top-level 'draftables' list)
         def looks_like_draftables(path: str) -> bool:
             try:
-                with open(path, "r", encoding="utf-8") as fh:
-                    payload = json.load(fh)
+                payload = _read_json(path)
                 return isinstance(payload, dict) and isinstance(payload.get("draftables"), list)
             except Exception:
                 return False
@@ -33,11 +53,9 @@ def find_single_json_in_data(data_dir: str = "data/") -> Optional[str]:
             return candidates[0]
         if len(candidates) > 1:
             # Fall back to most recently modified candidate
-            candidates.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-            return candidates[0]
+            return max(candidates, key=os.path.getmtime)
         # If nothing matched, fall back to the most recent non-contests JSON
-        files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-        return files[0]
+        return max(files, key=os.path.getmtime)
     # If only contests.json exists, we cannot determine a slate file
     return None
 
@@ -45,46 +63,90 @@ def find_single_json_in_data(data_dir: str = "data/") -> Optional[str]:
 def _parse_start_time(value: object) -> Optional[int]:
     if value is None:
         return None
+    if isinstance(value, str):
+        return _parse_start_time_str(value)
+    return _parse_start_time_uncached(value)
+
+
+@lru_cache(maxsize=256)
+def _parse_start_time_str(value: str) -> Optional[int]:
+    # A slate has one startTime per game, repeated across every draftable and both loaders
+    return _parse_start_time_uncached(value)
+
+
+def _parse_start_time_uncached(value: object) -> Optional[int]:
+    if isinstance(value, str):
+        try:
+            # DK start times are ISO-8601 ("...Z"); fromisoformat is far cheaper than pandas' format inference
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return int(dt.timestamp())
+        except ValueError:
+            pass
     try:
         # pandas handles many timestamp formats and timezones
         ts = pd.to_datetime(value, utc=True, errors="coerce")
         if pd.isna(ts):
             return None
-        # Convert to epoch seconds
-        return int(ts.to_pydatetime().timestamp())
+        # Convert to epoch seconds straight from the datetime64 value (no datetime/float round-trip)
+        return int(ts.asm8.astype("datetime64[s]").astype(np.int64))
     except Exception:
-        try:
-            # Fallback: try datetime.fromisoformat for simple cases
-            dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return int(dt.timestamp())
-        except Exception:
-            return None
+        return None
+
+
+def _parse_start_times(values: Iterable[object]) -> Dict[str, Optional[int]]:
+    """Map each distinct start-time string to epoch seconds (None if unparseable)."""
+    uniques = list(dict.fromkeys(v for v in values if isinstance(v, str)))
+    if not uniques:
+        return {}
+    # One vectorized ISO-8601 parse; anything it rejects goes through the lenient scalar path
+    ts = pd.to_datetime(pd.Index(uniques), utc=True, errors="coerce", format="ISO8601")
+    missing = ts.isna()
+    seconds = ts.as_unit("ns").asi8 // 1_000_000_000
+    return {
+        raw: (_parse_start_time(raw) if miss else int(sec))
+        for raw, miss, sec in zip(uniques, missing, seconds)
+    }
 
 
 def build_start_time_map(json_path: str) -> Dict[Tuple[str, str], int]:
     assert os.path.exists(json_path), f"Draftables JSON not found: {json_path}"
-    with open(json_path, "r", encoding="utf-8") as f:
-        payload = json.load(f)
+    payload = _read_json(json_path)
 
     # Expect structure with a top-level 'draftables' list; be resilient otherwise
     items = payload.get("draftables", []) if isinstance(payload, dict) else []
     out: Dict[Tuple[str, str], int] = {}
+    # A slate has only a few dozen distinct team codes; normalize each once
+    team_keys: Dict[str, str] = {}
+    # Every draftable in a game repeats its startTime; parse the distinct values in one batch
+    epoch_by_raw = _parse_start_times(
+        comp.get("startTime")
+        for comp in (it.get("competition") for it in items if isinstance(it, dict))
+        if isinstance(comp, dict)
+    )
 
     for it in items:
         try:
-            comp = it.get("competition", {}) if isinstance(it, dict) else {}
-            raw_time = comp.get("startTime")
-            epoch = _parse_start_time(raw_time)
-            if epoch is None:
-                continue
             # Name fields vary; prefer 'displayName', fallback to 'name'
             name_val = it.get("displayName") or it.get("name")
             team_val = it.get("teamAbbreviation") or it.get("team")
             if not name_val or not team_val:
                 continue
-            key = (str(name_val).upper().strip(), str(team_val).upper().strip())
+            comp = it.get("competition") or {}
+            raw_time = comp.get("startTime")
+            if isinstance(raw_time, str):
+                epoch = epoch_by_raw[raw_time]
+            else:
+                epoch = _parse_start_time(raw_time)
+            if epoch is None:
+                continue
+            team_key = team_keys.get(team_val) if isinstance(team_val, str) else None
+            if team_key is None:
+                team_key = str(team_val).upper().strip()
+                if isinstance(team_val, str):
+                    team_keys[team_val] = team_key
+            key = (str(name_val).upper().strip(), team_key)
             # Keep the latest time if duplicates appear; otherwise set
             prev = out.get(key)
             if prev is None or epoch > prev:
@@ -100,8 +162,7 @@ def _format_et(epoch_seconds: Optional[int], with_date: bool = True) -> str:
     if epoch_seconds is None:
         return ""
     try:
-        ts = pd.to_datetime(int(epoch_seconds), unit="s", utc=True)
-        et = ts.tz_convert("US/Eastern")
+        et = pd.Timestamp(int(epoch_seconds), unit="s", tz="UTC").tz_convert("US/Eastern")
         if with_date:
             return et.strftime("%Y-%m-%d %H:%M ET")
         return et.strftime("%H:%M ET")
@@ -115,17 +176,15 @@ def extract_games_table(json_path: str) -> pd.DataFrame:
     derived from the draftables JSON's competition blocks.
     """
     assert os.path.exists(json_path), f"Draftables JSON not found: {json_path}"
-    with open(json_path, "r", encoding="utf-8") as f:
-        payload = json.load(f)
+    payload = _read_json(json_path)
     items = payload.get("draftables", []) if isinstance(payload, dict) else []
 
     # Group teams by competition key; prefer competition.id when available, else (startTime, serialized teams set)
-    comps: Dict[str, Dict[str, object]] = {}
-    comp_to_teams: Dict[str, Set[str]] = {}
-    comp_to_home_flags: Dict[str, Dict[str, bool]] = {}
+    # One entry per competition: (competition block, teams); plus the first team flagged isHome
+    comps: Dict[str, Tuple[Dict[str, object], Set[str]]] = {}
+    comp_home_team: Dict[str, str] = {}
 
-    def _comp_key(it: dict) -> str:
-        comp = it.get("competition", {}) if isinstance(it, dict) else {}
+    def _comp_key(comp: dict) -> str:
         cid = comp.get("id") or comp.get("competitionId")
         st = comp.get("startTime")
         # Build a stable key string
@@ -134,63 +193,84 @@ def extract_games_table(json_path: str) -> pd.DataFrame:
     for it in items:
         if not isinstance(it, dict):
             continue
-        comp = it.get("competition", {}) if isinstance(it, dict) else {}
-        key = _comp_key(it)
-        if key not in comps:
-            comps[key] = comp
-            comp_to_teams[key] = set()
-            comp_to_home_flags[key] = {}
+        comp = it.get("competition") or {}
+        key = _comp_key(comp)
+        entry = comps.get(key)
+        if entry is None:
+            entry = comps[key] = (comp, set())
         team = it.get("teamAbbreviation") or it.get("team")
         if team:
             team_u = str(team).upper().strip()
-            comp_to_teams[key].add(team_u)
+            entry[1].add(team_u)
             # Capture home flag if present on either the draftable or inside competition mapping
-            is_home = it.get("isHome")
-            if isinstance(is_home, bool):
-                comp_to_home_flags[key][team_u] = is_home
-
-    # Build rows
-    records: List[Dict[str, object]] = []
-    for key, comp in comps.items():
-        st_epoch = _parse_start_time(comp.get("startTime")) if isinstance(comp, dict) else None
-        teams = sorted(list(comp_to_teams.get(key, [])))
+            if it.get("isHome") is True:
+                comp_home_team.setdefault(key, team_u)
+
+    # Build rows column-wise; Day/Time are filled in below once every kickoff is known
+    visiting_col: List[str] = []
+    home_col: List[str] = []
+    day_col: List[str] = []
+    time_col: List[str] = []
+    minute_col: List[Optional[int]] = []
+    dated: List[Tuple[int, int]] = []
+    epoch_by_raw = _parse_start_times(comp.get("startTime") for comp, _ in comps.values() if isinstance(comp, dict))
+    for key, (comp, team_set) in comps.items():
+        raw_time = comp.get("startTime") if isinstance(comp, dict) else None
+        st_epoch = epoch_by_raw[raw_time] if isinstance(raw_time, str) else _parse_start_time(raw_time)
+        if len(team_set) == 2:
+            # The usual two-team game: order the pair directly instead of sorting a set
+            a, b = team_set
+            teams = (a, b) if a < b else (b, a)
+        else:
+            teams = tuple(sorted(team_set))
         visiting, home = "", ""
         if len(teams) >= 2:
             # Try to infer home via flags
-            flags = comp_to_home_flags.get(key, {})
-            home_candidates = [t for t, is_h in flags.items() if is_h]
-            if home_candidates:
-                home = home_candidates[0]
+            home = comp_home_team.get(key, "")
+            if home:
                 visiting = teams[0] if teams[0] != home else teams[1]
             else:
                 # Final fallback: alphabetical order
                 visiting, home = teams[0], teams[1]
-        day = ""
-        time_str = ""
         if st_epoch is not None:
-            try:
-                ts = pd.to_datetime(int(st_epoch), unit="s", utc=True).tz_convert("US/Eastern")
-                day = ts.strftime("%Y-%m-%d")
-                time_str = ts.strftime("%H:%M ET")
-            except Exception:
-                pass
-        records.append({
-            "Visiting": visiting,
-            "Home": home,
-            "Day": day,
-            "Time": time_str,
-        })
-
-    # Deduplicate by Visiting+Home+Day+Time in case multiple competition keys collapse
-    if records:
-        df = pd.DataFrame.from_records(records)
-        df = df.drop_duplicates(subset=["Visiting", "Home", "Day", "Time"]).reset_index(drop=True)
-        # Sort by date/time
-        if "Day" in df.columns and "Time" in df.columns:
-            try:
-                sort_key = pd.to_datetime(df["Day"] + " " + df["Time"].str.replace(" ET", ""), errors="coerce")
-                df = df.assign(_sort=sort_key).sort_values(by=["_sort", "Home", "Visiting"]).drop(columns=["_sort"]).reset_index(drop=True)
-            except Exception:
-                pass
-        return df
-    return pd.DataFrame({"Visiting": [], "Home": [], "Day": [], "Time": []})
+            dated.append((len(visiting_col), int(st_epoch)))
+        visiting_col.append(visiting)
+        home_col.append(home)
+        day_col.append("")
+        time_col.append("")
+        minute_col.append(None)
+
+    # Convert every kickoff to ET in one vectorized pass rather than a Timestamp per game
+    if dated:
+        try:
+            ts = pd.to_datetime(np.array([e for _, e in dated], dtype=np.int64), unit="s", utc=True).tz_convert("US/Eastern")
+            for (row, epoch), day, time_str in zip(dated, ts.strftime("%Y-%m-%d"), ts.strftime("%H:%M ET")):
+                day_col[row] = day
+                time_col[row] = time_str
+                minute_col[row] = epoch // 60
+        except Exception:
+            # Out-of-range epochs: format the rest one by one, leaving bad ones blank
+            for row, epoch in dated:
+                try:
+                    et = pd.Timestamp(epoch, unit="s", tz="UTC").tz_convert("US/Eastern")
+                    day_col[row] = et.strftime("%Y-%m-%d")
+                    time_col[row] = et.strftime("%H:%M ET")
+                    minute_col[row] = epoch // 60
+                except Exception:
+                    pass
+
+    # Deduplicate by Visiting+Home+Day+Time in case multiple competition keys collapse (first wins),
+    # then sort by kickoff minute (games without a time last), Home, Visiting
+    unique: Dict[Tuple[str, str, str, str], int] = {}
+    for row, row_key in enumerate(zip(visiting_col, home_col, day_col, time_col)):
+        unique.setdefault(row_key, row)
+    order = sorted(
+        unique.values(),
+        key=lambda row: (minute_col[row] is None, minute_col[row] or 0, home_col[row], visiting_col[row]),
+    )
+    return pd.DataFrame({
+        "Visiting": [visiting_col[row] for row in order],
+        "Home": [home_col[row] for row in order],
+        "Day": [day_col[row] for row in order],
+        "Time": [time_col[row] for row in order],
+    })
@@ -6,6 +6,7 @@ import tempfile
 import pandas as pd
 
 from src.feature_diversify.io_excel import SourceKey, read_lineups_from_source
+from src.io_utils import parquet_sidecar_path, write_parquet_sidecar
 
 
 def test_read_lineups_from_source_roster_columns(tmp_path):
@@ -36,3 +37,37 @@ def test_read_lineups_from_source_roster_columns(tmp_path):
     assert len(next(iter(recs)).player_tokens) >= 7
 
 
+
+
+_ROSTER = ["QB", "RB1", "RB2", "WR1", "WR2", "WR3", "TE", "FLEX", "DST"]
+
+
+def _lineup_df(tag):
+    return pd.DataFrame([{"Projection": 100.0, **{c: f"{c} {tag} (X)" for c in _ROSTER}}])
+
+
+def _write_lineups(path, tag):
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        _lineup_df(tag).to_excel(writer, sheet_name="Lineups", index=False)
+
+
+def _qb_token(path):
+    recs = read_lineups_from_source(SourceKey(path=path))
+    return next(t for t in recs[0].player_tokens if t.startswith("QB "))
+
+
+def test_parquet_sidecar_used_only_when_stamped_for_workbook(tmp_path):
+    path = os.path.join(tmp_path, "bundle.xlsx")
+    _write_lineups(path, "Xlsx")
+
+    # A plain Parquet file with the same stem (e.g. `aggregate --out bundle.parquet`) is ignored
+    _lineup_df("Plain").to_parquet(parquet_sidecar_path(path), index=False)
+    assert _qb_token(path) == "QB Xlsx|X"
+
+    write_parquet_sidecar(path, "Lineups", _lineup_df("Sidecar"))
+    assert _qb_token(path) == "QB Sidecar|X"
+
+    # Rewriting the workbook invalidates the stamp, even though the sidecar is newer
+    _write_lineups(path, "Rewritten")
+    os.utime(parquet_sidecar_path(path))
+    assert _qb_token(path) == "QB Rewritten|X"
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from src.feature_diversify.selector import jaccard_distance, farthest_first_with_quotas
+from src.feature_diversify.selector import jaccard_distance, farthest_first_with_quotas, pairwise_jaccard_matrix
 from src.feature_diversify.io_excel import LineupRecord
 
 
@@ -23,6 +23,34 @@ def test_jaccard_distance_basic():
     assert abs(d - 0.5) < 1e-9
 
 
+def test_pairwise_jaccard_matrix_matches_scalar():
+    sets = [{"A", "B", "C"}, {"A", "B", "D"}, {"E"}, set(), set()]
+    m = pairwise_jaccard_matrix(sets)
+    assert m.shape == (5, 5)
+    for i, a in enumerate(sets):
+        for j, b in enumerate(sets):
+            assert abs(m[i, j] - jaccard_distance(a, b)) < 1e-12
+
+
+def test_pairwise_jaccard_matrix_spans_multiple_words():
+    # More than 64 distinct tokens forces several uint64 words per row
+    sets = [{f"P{i}" for i in range(k, k + 50)} for k in (0, 30, 60, 100)]
+    m = pairwise_jaccard_matrix(sets)
+    for i, a in enumerate(sets):
+        for j, b in enumerate(sets):
+            assert abs(m[i, j] - jaccard_distance(a, b)) < 1e-12
+
+
+def test_distance_row_sums_match_full_matrix_across_blocks():
+    from src.feature_diversify.selector import _distance_row_sums, _encode_bitmatrix
+    sets = [{f"P{(i * 7 + k) % 23}" for k in range(i % 6)} for i in range(40)]
+    bits, card = _encode_bitmatrix(sets)
+    expected = pairwise_jaccard_matrix(sets).sum(axis=1)
+    for block_rows in (1, 3, 16, 64):
+        sums = _distance_row_sums(bits, card, block_rows=block_rows)
+        assert abs(sums - expected).max() < 1e-9
+
+
 def test_farthest_first_with_quotas_respects_sources():
     # Two sources, pick 1 from each, ensure global diversification
     recs = [
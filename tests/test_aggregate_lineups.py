@@ -0,0 +1,29 @@
+from datetime import datetime
+
+import openpyxl
+import pandas as pd
+
+from tools.aggregate_lineups import Source, aggregate
+
+
+def test_aggregate_keeps_dates_and_header_style(tmp_path):
+    df = pd.DataFrame({
+        "Projection": [90.0, 100.0],
+        "QB": ["B (Y)", "A (X)"],
+        "Game Stack": ["g", "g"],
+        "Start": pd.to_datetime(["2025-09-14 16:25", "2025-09-14 13:00"]),
+    })
+    src = tmp_path / "run1.xlsx"
+    df.to_excel(src, sheet_name="Lineups", index=False)
+    out = tmp_path / "bundle.xlsx"
+
+    total, _ = aggregate(str(out), "Label", [Source(str(src), "L1")], "Lineups", dk_entries_path=str(tmp_path / "none.csv"))
+    assert total == 2
+
+    sheet = openpyxl.load_workbook(out)["Lineups"]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0] == ("Rank", "Projection", "QB", "Game Stack", "Label", "Start")
+    assert rows[1] == (1, 100, "A (X)", "g", "L1", datetime(2025, 9, 14, 13, 0))
+    assert rows[2] == (2, 90, "B (Y)", "g", "L1", datetime(2025, 9, 14, 16, 25))
+    assert sheet["F2"].number_format == "YYYY-MM-DD HH:MM:SS"
+    assert all(cell.font.b for cell in sheet[1])
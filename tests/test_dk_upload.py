@@ -0,0 +1,136 @@
+import pandas as pd
+
+from src.dk_upload import extract_base_names, format_lineups_for_dk, load_dk_entries
+
+
+HEADER = "Entry ID,Contest Name,,Position,Name + ID,Name,ID,Roster Position,Salary,Game Info,TeamAbbrev,AvgPointsPerGame"
+
+
+def _write_crlf(path, lines):
+    with open(path, "w", newline="") as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+
+def test_load_dk_entries_ragged_rows_crlf_offset_header(tmp_path):
+    path = tmp_path / "DKEntries.csv"
+    _write_crlf(path, [
+        "Entry ID,Contest Name,,",
+        HEADER,
+        "1,Contest,,QB,Josh Allen (1001),Josh Allen,1001,QB,7000,BUF@MIA,BUF,25.1,extra,extra",
+        ",,,DST,Bills (2001),Bills ,2001",
+        ",,,WR,Short (3),Short",
+        "",
+        ",,,RB,Wide (4),Wide,4,RB,5000,BUF@MIA,MIA,10,,,,,",
+    ])
+    df = load_dk_entries(str(path))
+    assert list(df.columns) == ["Name", "ID", "Position", "TeamAbbrev"]
+    assert df.values.tolist() == [
+        ["Josh Allen", "1001", "QB", "BUF"],
+        ["Bills", "2001", "DST", ""],
+        ["Short", "", "WR", ""],
+        ["Wide", "4", "RB", "MIA"],
+    ]
+
+
+def test_load_dk_entries_all_rows_shorter_than_header(tmp_path):
+    path = tmp_path / "DKEntries.csv"
+    _write_crlf(path, [
+        HEADER,
+        ",,,DST,Bills (2001),Bills,2001",
+        ",,,WR,Short (3),Short",
+    ])
+    df = load_dk_entries(str(path))
+    assert df.values.tolist() == [["Bills", "2001", "DST", ""], ["Short", "", "WR", ""]]
+
+
+def test_load_dk_entries_missing_header_or_rows(tmp_path):
+    no_header = tmp_path / "none.csv"
+    _write_crlf(no_header, ["a,b,c", "1,2,3"])
+    header_only = tmp_path / "header.csv"
+    _write_crlf(header_only, [HEADER])
+    for path in (no_header, header_only):
+        df = load_dk_entries(str(path))
+        assert df.empty
+        assert list(df.columns) == ["Name", "ID", "Position", "TeamAbbrev"]
+
+
+def test_extract_base_names_strips_ids_and_keeps_index():
+    values = pd.Series(["Josh Allen (1001)", " Bills (2001) ", "Plain Name", None, float("nan"), "Josh Allen (1001)"],
+                       index=[10, 11, 12, 13, 14, 15], name="QB", dtype=object)
+    out = extract_base_names(values)
+    assert out.tolist() == ["Josh Allen", "Bills", "Plain Name", "", "nan", "Josh Allen"]
+    assert out.index.tolist() == [10, 11, 12, 13, 14, 15]
+    assert out.name == "QB"
+
+
+def test_extract_base_names_empty_non_string_input():
+    # An all-NaN slot column is float64; dropna() leaves an empty float Series
+    values = pd.Series([float("nan"), float("nan")], name="FLEX").dropna()
+    out = extract_base_names(values)
+    assert out.empty
+    assert out.name == "FLEX"
+    assert extract_base_names(pd.Series([], dtype="int64")).tolist() == []
+
+
+class _ListLogger:
+    def __init__(self):
+        self.messages = []
+
+    def warning(self, msg):
+        self.messages.append(msg)
+
+
+def test_format_lineups_for_dk_resolves_ids_with_dst_fallback():
+    lineups = pd.DataFrame(
+        {
+            "Projection": [100.0, 90.0],
+            "QB": ["Josh Allen (BUF)", None],
+            "RB1": ["Blank Guy (MIA)", "Dup Name (MIA)"],
+            "FLEX": ["Buffalo D (BUF)", float("nan")],
+            "DST": ["Bills (BUF)", "Dolphins (MIA)"],
+        },
+        dtype=object,
+    )
+    original = lineups.copy()
+    projections = pd.DataFrame(
+        {
+            "Name": ["Josh Allen", "Buffalo D", "Bills", "Dolphins"],
+            "Position": ["QB", "DST", "DST", "DST"],
+            "Team": ["BUF", "buf", "BUF", "MIA"],
+        }
+    )
+    dk_entries = pd.DataFrame(
+        {
+            "Name": ["Josh Allen", "Blank Guy", "Dup Name", "Dup Name", "Buffalo", "Miami Blank", "Miami"],
+            "ID": ["1001", "  ", "", "3003", "2001", "", "2002"],
+            "Position": ["QB", "RB", "RB", "RB", "DST", "DST", "DST"],
+            "TeamAbbrev": ["BUF", "MIA", "MIA", "MIA", "buf", "MIA", "MIA"],
+        }
+    )
+    logger = _ListLogger()
+    out = format_lineups_for_dk(lineups, projections, dk_entries, logger=logger)
+
+    assert out["Projection"].tolist() == [100.0, 90.0]
+    # None is a blank cell; NaN keeps its str() spelling and is reported as unresolved
+    assert out["QB"].tolist() == ["Josh Allen (1001)", ""]
+    # Blank IDs never resolve; a later non-empty ID for the same name does
+    assert out["RB1"].tolist() == ["Blank Guy", "Dup Name (3003)"]
+    # A DST outside the DST slot and every DST slot fall back to the team's DK DST ID
+    assert out["FLEX"].tolist() == ["Buffalo D (2001)", "nan"]
+    assert out["DST"].tolist() == ["Bills (2001)", "Dolphins (2002)"]
+    assert len(logger.messages) == 1
+    assert logger.messages[0].endswith("['Blank Guy', 'nan']")
+    # The input frame is left untouched
+    pd.testing.assert_frame_equal(lineups, original)
+
+
+def test_format_lineups_for_dk_override_and_empty_inputs():
+    lineups = pd.DataFrame({"QB": ["Josh Allen (BUF)"], "DST": ["Bills (BUF)"]})
+    dk_entries = pd.DataFrame({"Name": ["Josh Allen"], "ID": ["1001"], "Position": ["QB"], "TeamAbbrev": ["BUF"]})
+    out = format_lineups_for_dk(lineups, pd.DataFrame({"Name": []}), dk_entries, logger=_ListLogger(),
+                                name_to_id_override={"Josh Allen": "9001", "Bills": "9002"})
+    assert out.iloc[0].tolist() == ["Josh Allen (9001)", "Bills (9002)"]
+
+    assert format_lineups_for_dk(lineups.iloc[:0], pd.DataFrame(), dk_entries).empty
+    no_slots = pd.DataFrame({"Projection": [1.0]})
+    pd.testing.assert_frame_equal(format_lineups_for_dk(no_slots, pd.DataFrame(), dk_entries), no_slots)
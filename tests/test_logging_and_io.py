@@ -1,8 +1,13 @@
 import os
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import openpyxl
 import pandas as pd
 
 from src.logging_utils import setup_logger
-from src.io_utils import ensure_dir, write_csv, read_csv, write_excel_with_tabs
+from src.io_utils import XLSX_WRITE_OPTIONS, ensure_dir, write_csv, read_csv, write_excel_with_tabs, write_sheet_rows
 
 
 def test_setup_logger_idempotent():
@@ -27,3 +32,31 @@ def test_write_excel_with_tabs(tmp_path):
     xls_path = tmp_path / "book.xlsx"
     write_excel_with_tabs(projections, params, lineups, str(xls_path))
     assert xls_path.exists()
+
+
+def test_write_sheet_rows_coerces_cells(tmp_path):
+    df = pd.DataFrame({
+        "int": np.array([1, 2], dtype=np.int64),
+        "float": [1.5, np.nan],
+        "inf": [np.inf, -np.inf],
+        "scalars": pd.Series([np.int64(3), np.float32(0.5)], dtype=object),
+        "time": pd.to_datetime(["2025-09-14 13:00", None]),
+        "nullable": pd.array([1, None], dtype="Int64"),
+        "flag": [True, False],
+        "text": ["=1+1", "007"],
+        "day": pd.Series([date(2025, 9, 14), None], dtype=object),
+        "decimal": pd.Series([Decimal("2.25"), Decimal("NaN")], dtype=object),
+    })
+    path = tmp_path / "rows.xlsx"
+    with pd.ExcelWriter(path, engine="xlsxwriter", engine_kwargs={"options": dict(XLSX_WRITE_OPTIONS)}) as writer:
+        write_sheet_rows(writer, "Rows", df)
+    sheet = openpyxl.load_workbook(path)["Rows"]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0] == tuple(df.columns)
+    # NaN/NaT/NA become blank cells, inf is spelled out, numpy scalars and Decimals are unwrapped,
+    # datetimes stay Excel dates and strings are written verbatim (no formula or number conversion)
+    assert rows[1] == (1, 1.5, "inf", 3, datetime(2025, 9, 14, 13, 0), 1, True, "=1+1", datetime(2025, 9, 14), 2.25)
+    assert rows[2] == (2, None, "-inf", 0.5, None, None, False, "007", None, None)
+    # Date cells carry the number formats to_excel uses
+    assert sheet["E2"].number_format == "YYYY-MM-DD HH:MM:SS"
+    assert sheet["I2"].number_format == "YYYY-MM-DD"
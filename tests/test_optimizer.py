@@ -1,7 +1,9 @@
 import pandas as pd
+import pulp
+import pytest
 
 from src.models import players_from_df, Parameters
-from src.optimizer import generate_lineups, lineups_to_dataframe
+from src.optimizer import _make_solver, generate_lineups, lineups_to_dataframe
 
 
 def synthetic_players_df():
@@ -121,3 +123,38 @@ def test_rb_vs_dst_constraint_allows_when_true():
     lineups = generate_lineups(players, params)
     # With flag enabled, at least one lineup should be feasible
     assert len(lineups) >= 1
+
+
+def _force_cbc(monkeypatch):
+    monkeypatch.setattr(pulp.HiGHS, "available", lambda self: False)
+
+
+def test_make_solver_falls_back_to_cbc(monkeypatch):
+    _force_cbc(monkeypatch)
+    solver, name = _make_solver({"msg": False, "threads": 1})
+    assert name == "CBC"
+    assert isinstance(solver, pulp.PULP_CBC_CMD)
+
+    players = players_from_df(synthetic_players_df())
+    params = Parameters(lineup_count=3, min_salary=43000, solver_threads=1)
+    lineups = generate_lineups(players, params)
+    assert len(lineups) == 3
+    assert len({frozenset(p.name for p in lu.players) for lu in lineups}) == 3
+
+
+def test_highs_matches_cbc(monkeypatch):
+    pytest.importorskip("highspy")
+    assert _make_solver({"msg": False, "threads": 1})[1] == "HiGHS"
+    players = players_from_df(synthetic_players_df())
+    params = Parameters(lineup_count=4, min_salary=43000, solver_threads=1)
+    highs_lineups = generate_lineups(players, params)
+
+    _force_cbc(monkeypatch)
+    assert _make_solver({"msg": False, "threads": 1})[1] == "CBC"
+    cbc_lineups = generate_lineups(players, params)
+
+    # Each re-solve only excludes the lineups already found, so the objective sequence is
+    # solver-independent even where ties let the solvers pick different rosters
+    assert len(highs_lineups) == len(cbc_lineups) == 4
+    assert [round(lu.total_projection, 6) for lu in highs_lineups] == [round(lu.total_projection, 6) for lu in cbc_lineups]
+    assert {p.name for p in highs_lineups[0].players} == {p.name for p in cbc_lineups[0].players}
@@ -1,6 +1,7 @@
 import re
 import numpy as np
 import pandas as pd
+import pytest
 
 from src.models import players_from_df, Parameters
 from src.optimizer import generate_lineups, lineups_to_dataframe
@@ -55,9 +56,14 @@ def synthetic_pool_df():
     return pd.DataFrame(data)
 
 
-def test_end_to_end_smoke():
-    df = synthetic_pool_df()
-    players = players_from_df(df)
+@pytest.fixture(scope="module")
+def synthetic_players():
+    # The pool never changes; build and parse it once per module
+    return players_from_df(synthetic_pool_df())
+
+
+def test_end_to_end_smoke(synthetic_players):
+    players = synthetic_players
     params = Parameters(lineup_count=3, min_salary=43000, stack=1, game_stack=0)
 
     lineups = generate_lineups(players, params, max_lineups=3)
@@ -8,7 +8,10 @@ from typing import List, Tuple, Optional
 import os as _os
 import sys as _sys
 
+import numpy as np
+import openpyxl
 import pandas as pd
+from pandas.io.parsers import TextParser
 # Ensure project root is on sys.path so 'src' can be imported when running this script directly
 try:
     _ROOT = _os.path.abspath(_os.path.join(_os.path.dirname(__file__), ".."))
@@ -16,10 +19,11 @@ try:
         _sys.path.insert(0, _ROOT)
 except Exception:
     pass
-from src.dk_upload import load_dk_entries, format_lineups_for_dk
+from src.dk_upload import extract_base_names, load_dk_entries, format_lineups_for_dk
+from src.io_utils import XLSX_WRITE_OPTIONS, map_files, write_parquet_sidecar, write_sheet_rows
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Source:
     path: str
     value: str
@@ -27,7 +31,7 @@ class Source:
 
 def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Aggregate Lineups sheets across multiple Excel workbooks")
-    p.add_argument("--out", required=True, help="Output Excel path for aggregated results")
+    p.add_argument("--out", required=True, help="Output Excel path for aggregated results (a .parquet path writes only the combined sheet, as Parquet)")
     p.add_argument("--column-name", required=True, help="Name of the extra column to add (e.g., QB or Game)")
     p.add_argument(
         "--src",
@@ -39,6 +43,7 @@ def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     p.add_argument("--engine", default="xlsxwriter", help="ExcelWriter engine (xlsxwriter or openpyxl)")
     p.add_argument("--no-extra-column", action="store_true", help="Do not add an extra column; just concatenate and re-rank")
     p.add_argument("--dk-entries", default="data/DKEntries.csv", help="Path to DK entries CSV for DK Lineups tab")
+    p.add_argument("--parquet", action="store_true", help="Also write the combined sheet to a sibling .parquet file")
     return p.parse_args(argv)
 
 
@@ -58,12 +63,53 @@ def _parse_sources(src_args: List[str]) -> List[Source]:
     return sources
 
 
+def _excel_value(value: object) -> object:
+    # Same cell coercion as pandas' openpyxl reader: blanks -> "", integral floats -> int
+    if value is None:
+        return ""
+    if type(value) is float and value.is_integer():
+        return int(value)
+    return value
+
+
+def _read_lineups_fast(path: str, sheet_name: str) -> pd.DataFrame:
+    """Read one sheet by streaming raw cell values from a read-only openpyxl workbook.
+
+    pd.read_excel builds an openpyxl cell object per value; values_only rows skip that, and the
+    header/type inference is still pandas' own TextParser so the result matches read_excel.
+    """
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[sheet_name]
+        ws.reset_dimensions()
+        rows: List[List[object]] = []
+        last_with_data = -1
+        for i, raw in enumerate(ws.iter_rows(values_only=True)):
+            row = [_excel_value(v) for v in raw]
+            while row and row[-1] == "":
+                row.pop()
+            if row:
+                last_with_data = i
+            rows.append(row)
+    finally:
+        wb.close()
+    rows = rows[: last_with_data + 1]
+    if not rows:
+        return pd.DataFrame()
+    width = max(len(r) for r in rows)
+    rows = [r + [""] * (width - len(r)) if len(r) < width else r for r in rows]
+    return TextParser(rows, header=0).read()
+
+
 def _read_lineups(path: str, sheet_name: str) -> pd.DataFrame | None:
     if not os.path.exists(path):
         print(f"Warning: file not found: {path}", file=sys.stderr)
         return None
     try:
-        df = pd.read_excel(path, sheet_name=sheet_name)
+        try:
+            df = _read_lineups_fast(path, sheet_name)
+        except Exception:
+            df = pd.read_excel(path, sheet_name=sheet_name)
     except Exception as e:
         print(f"Warning: failed reading '{sheet_name}' from {path}: {e}", file=sys.stderr)
         return None
@@ -73,118 +119,158 @@ def _read_lineups(path: str, sheet_name: str) -> pd.DataFrame | None:
     return df
 
 
-def _insert_after(df: pd.DataFrame, new_col: str, series: pd.Series, after_col: str) -> pd.DataFrame:
-    cols = list(df.columns)
+def _excel_writer(out_path: str, engine: str) -> pd.ExcelWriter:
+    if engine == "xlsxwriter":
+        return pd.ExcelWriter(out_path, engine=engine, engine_kwargs={"options": dict(XLSX_WRITE_OPTIONS)})
+    return pd.ExcelWriter(out_path, engine=engine)
+
+
+def _write_sheet(writer: pd.ExcelWriter, sheet_name: str, df: pd.DataFrame) -> None:
+    if writer.engine == "xlsxwriter":
+        # pandas' to_excel emits cells column by column, which constant_memory sheets would drop
+        write_sheet_rows(writer, sheet_name, df)
+    else:
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def _write_empty(out_path: str, sheet_name: str, engine: str) -> pd.DataFrame:
+    # Callers still expect an output workbook when every source was missing or empty
+    empty = pd.DataFrame()
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with _excel_writer(out_path, engine) as writer:
+        _write_sheet(writer, sheet_name, empty)
+    return empty
+
+
+def _write_dk_lineups(writer: pd.ExcelWriter, combined: pd.DataFrame, dk_entries: Optional[pd.DataFrame], dk_entries_path: str) -> None:
     try:
-        idx = cols.index(after_col)
-    except ValueError:
-        df[new_col] = series
-        return df
-    left = cols[: idx + 1]
-    right = cols[idx + 1 :]
-    df[new_col] = series
-    return df[left + [new_col] + right]
+        # Callers aggregating several bundles can pass pre-loaded entries to avoid re-parsing the CSV
+        if dk_entries is None:
+            dk_entries = load_dk_entries(dk_entries_path)
+        # For aggregation we don't have projections_df here; build a minimal frame with Name only
+        # Heuristic: extract base names from player columns
+        dk_source = combined
+        # If an extra label column conflicts with a player slot (e.g., QB), temporarily rename it so
+        # DK formatting sees uniquely named player columns
+        if "QB" in dk_source.columns and "QB_orig" in dk_source.columns:
+            dk_source = dk_source.rename(columns={"QB_orig": "QB", "QB": "QB Label"})
+        slot_cells: List[pd.Series] = []
+        for base in ["QB", "RB1", "RB2", "WR1", "WR2", "WR3", "TE", "FLEX", "DST"]:
+            col = base if base in dk_source.columns else (f"{base}_orig" if f"{base}_orig" in dk_source.columns else None)
+            if not col:
+                continue
+            slot_cells.append(dk_source[col].dropna())
+        # Lineups repeat the same players; extract names once over the distinct cells of every slot
+        names: set = set()
+        if slot_cells:
+            distinct = pd.concat(slot_cells, ignore_index=True).drop_duplicates()
+            names.update(extract_base_names(distinct).tolist())
+        proj_min = pd.DataFrame({"Name": sorted(n for n in names if n)})
+        dk_tab = format_lineups_for_dk(dk_source, proj_min, dk_entries)
+        _write_sheet(writer, "DK Lineups", dk_tab)
+    except Exception as e:
+        print(f"Warning: failed to write DK Lineups sheet: {e}", file=sys.stderr)
+
+
+def _is_parquet(out_path: str) -> bool:
+    return out_path.lower().endswith(".parquet")
+
+
+def _write_parquet(out_path: str, df: pd.DataFrame) -> None:
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    df.to_parquet(out_path, index=False, compression="snappy")
+
+
+def _read_all_lineups(sources: List[Source], sheet_name: str) -> List[pd.DataFrame | None]:
+    # map() keeps source order; large inputs parse one workbook per process
+    paths = [s.path for s in sources]
+    return map_files(_read_lineups, paths, paths, [sheet_name] * len(paths))
 
 
-def aggregate(out_path: str, column_name: str, sources: List[Source], sheet_name: str, engine: str = "xlsxwriter", add_extra_column: bool = True, dk_entries_path: Optional[str] = None) -> Tuple[int, pd.DataFrame]:
+def aggregate(out_path: str, column_name: str, sources: List[Source], sheet_name: str, engine: str = "xlsxwriter", add_extra_column: bool = True, dk_entries_path: Optional[str] = None, parquet_sidecar: bool = False, dk_entries: Optional[pd.DataFrame] = None, return_combined: bool = False) -> Tuple[int, Optional[pd.DataFrame]]:
     parts: List[pd.DataFrame] = []
-    for s in sources:
-        df = _read_lineups(s.path, sheet_name)
+    for s, df in zip(sources, _read_all_lineups(sources, sheet_name)):
         if df is None or df.empty:
             continue
         if "Rank" in df.columns:
             df = df.drop(columns=["Rank"])  # type: ignore
-        df["Projection"] = pd.to_numeric(df["Projection"], errors="coerce")
-        df = df.dropna(subset=["Projection"])  # type: ignore
+        # Sheets written by the optimizer already hold float projections; only coerce anything else
+        if df["Projection"].dtype.kind != "f":
+            df["Projection"] = pd.to_numeric(df["Projection"], errors="coerce")
+        if df["Projection"].isna().any():
+            df = df.dropna(subset=["Projection"])  # type: ignore
         if add_extra_column:
             # Avoid duplicate column names from prior aggregations
             if column_name in df.columns:
                 df = df.rename(columns={column_name: f"{column_name}_orig"})
-            df[column_name] = s.value
-            if "Game Stack" in df.columns:
-                df = _insert_after(df, column_name, df[column_name], "Game Stack")
+            # One insert straight into place: right after Game Stack when present, else at the end
+            cols = list(df.columns)
+            pos = cols.index("Game Stack") + 1 if "Game Stack" in cols else len(cols)
+            df.insert(pos, column_name, s.value)
         parts.append(df)
 
     if not parts:
         print("No input sheets found; nothing to aggregate", file=sys.stderr)
-        empty = pd.DataFrame()
-        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
-        with pd.ExcelWriter(out_path, engine=engine) as writer:
-            empty.to_excel(writer, sheet_name, index=False)
-        return 0, empty
+        if _is_parquet(out_path):
+            empty = pd.DataFrame()
+            _write_parquet(out_path, empty)
+        else:
+            empty = _write_empty(out_path, sheet_name, engine)
+        return 0, (empty if return_combined else None)
 
     combined = pd.concat(parts, axis=0, ignore_index=True)
-    combined = combined.sort_values(by=["Projection"], ascending=False, kind="mergesort").reset_index(drop=True)
-    combined["Rank"] = range(1, len(combined) + 1)
-    cols = list(combined.columns)
-    if "Rank" in cols:
-        cols.remove("Rank")
-        cols = ["Rank"] + cols
-        combined = combined[cols]
+    del parts
+    # Stable descending sort on the projection values, then Rank goes straight in as the first column
+    order = np.argsort(-combined["Projection"].to_numpy(dtype=np.float64), kind="stable")
+    combined = combined.take(order).reset_index(drop=True)
+    if "Rank" in combined.columns:
+        # Only possible when the label column itself is named Rank; the new ranking replaces it
+        combined = combined.drop(columns=["Rank"])
+    combined.insert(0, "Rank", np.arange(1, len(combined) + 1, dtype=np.int64))
+
+    if _is_parquet(out_path):
+        # Programmatic consumers skip the Excel write (and its DK Lineups/Summary tabs) entirely
+        _write_parquet(out_path, combined)
+        return len(combined), (combined if return_combined else None)
 
     out_dir = os.path.dirname(out_path) or "."
     os.makedirs(out_dir, exist_ok=True)
-    with pd.ExcelWriter(out_path, engine=engine) as writer:
-        combined.to_excel(writer, sheet_name, index=False)
+    with _excel_writer(out_path, engine) as writer:
+        _write_sheet(writer, sheet_name, combined)
         # Attempt to write DK Lineups tab using DK entries mapping
-        try:
-            if dk_entries_path:
-                dk_entries = load_dk_entries(dk_entries_path)
-            else:
-                dk_entries = load_dk_entries()
-            # For aggregation we don't have projections_df here; build a minimal frame with Name/Position/Team if present
-            # Heuristic: extract base names from player columns and construct a frame with Name only
-            player_cols = [c for c in ["QB", "RB1", "RB2", "WR1", "WR2", "WR3", "TE", "FLEX", "DST"] if c in combined.columns or f"{c}_orig" in combined.columns]
-            proj_min = pd.DataFrame({"Name": []})
-            if player_cols:
-                # Collect names from combined by stripping trailing parentheticals
-                def _extract(value: object) -> str:
-                    s = str(value)
-                    if s.endswith(")") and "(" in s:
-                        try:
-                            return s.rsplit(" (", 1)[0]
-                        except Exception:
-                            return s
-                    return s
-                names_series = pd.Series(dtype=object)
-                # Build a DK formatting source where player columns are uniquely named
-                dk_source = combined.copy()
-                # If an extra label column conflicts with a player slot (e.g., QB), temporarily rename it
-                if "QB" in dk_source.columns and "QB_orig" in dk_source.columns:
-                    dk_source = dk_source.rename(columns={"QB_orig": "QB", "QB": "QB Label"})
-                for base in ["QB", "RB1", "RB2", "WR1", "WR2", "WR3", "TE", "FLEX", "DST"]:
-                    col = base if base in dk_source.columns else (f"{base}_orig" if f"{base}_orig" in dk_source.columns else None)
-                    if not col:
-                        continue
-                    names_series = pd.concat([names_series, dk_source[col].dropna().astype(str).map(_extract)], ignore_index=True)
-                unique_names = sorted(set(n for n in names_series.tolist() if n))
-                proj_min = pd.DataFrame({"Name": unique_names})
-            # Use the DK source with uniquely named player columns for formatting
-            if 'dk_source' not in locals():
-                dk_source = combined.copy()
-            dk_tab = format_lineups_for_dk(dk_source, proj_min, dk_entries)
-            dk_tab.to_excel(writer, "DK Lineups", index=False)
-        except Exception as e:
-            print(f"Warning: failed to write DK Lineups sheet: {e}", file=sys.stderr)
+        entries_path = dk_entries_path or "data/DKEntries.csv"
+        if dk_entries is None and not os.path.exists(entries_path):
+            print(f"Warning: DK entries not found at {entries_path}; skipping DK Lineups sheet", file=sys.stderr)
+        else:
+            _write_dk_lineups(writer, combined, dk_entries, entries_path)
         try:
             # Pick the last matching column name to avoid ambiguity if duplicates exist
             matching_cols = [i for i, c in enumerate(combined.columns) if c == column_name]
             if not matching_cols:
                 raise ValueError(f"Missing column '{column_name}' in combined data")
             series = combined.iloc[:, matching_cols[-1]]
+            # String columns take "" for blanks as-is; only other dtypes need the object copy first
+            labels = series.fillna("") if isinstance(series.dtype, pd.StringDtype) else series.astype(object).fillna("")
+            # One unsorted groupby pass (the sort below orders it); name the label axis and the count directly
             summary = (
-                series.astype(object)
-                .fillna("")
-                .value_counts(dropna=False)
-                .reset_index()
-                .rename(columns={"index": column_name, column_name: "Lineups"})
+                labels.groupby(labels, sort=False)
+                .size()
+                .rename_axis(column_name)
+                .reset_index(name="Lineups")
             )
-            summary = summary.sort_values(by=["Lineups", column_name], ascending=[False, True])
-            summary.to_excel(writer, "Summary", index=False)
+            summary = summary.sort_values(by=["Lineups", column_name], ascending=[False, True], kind="mergesort")
+            _write_sheet(writer, "Summary", summary)
         except Exception as e:
             print(f"Warning: failed to write Summary sheet: {e}", file=sys.stderr)
 
-    return len(combined), combined
+    if parquet_sidecar:
+        # Machine-readable copy of the combined sheet; much cheaper to re-read than xlsx
+        try:
+            write_parquet_sidecar(out_path, sheet_name, combined)
+        except Exception as e:
+            print(f"Warning: failed to write Parquet sidecar: {e}", file=sys.stderr)
+
+    return len(combined), (combined if return_combined else None)
 
 
 def main(argv: List[str] | None = None) -> int:
@@ -198,6 +284,7 @@ def main(argv: List[str] | None = None) -> int:
         args.engine,
         add_extra_column=(not args.no_extra_column),
         dk_entries_path=args.dk_entries,
+        parquet_sidecar=args.parquet,
     )
     print(f"Aggregated {total} lineups into {args.out}")
     return 0